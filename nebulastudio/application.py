@@ -1,14 +1,25 @@
 from PyQt6.QtWidgets import QApplication, QFileDialog
+from PyQt6.QtGui import QIcon
+from collections import OrderedDict
+from typing import Any
+import copy
 import os
 import yaml
 import logging
 from nebulastudio.nebulastudio import NebulaStudio
+from nebulastudio.utils.yamlfile import SafeLoader
 
 
 class NebulaStudioApplication(QApplication):
+    # Maximum number of parsed YAML documents kept by load_yaml
+    YAML_CACHE_SIZE = 100
+
     def __init__(self, argv):
         super().__init__(argv)
+        # Parsed YAML documents, keyed by path and validated against (mtime, size)
+        self._yaml_cache: OrderedDict[str, tuple[float, int, Any]] = OrderedDict()
         self.windows: list[NebulaStudio] = []
+        self._window_icon: QIcon | None = None
         self.setApplicationName("Nebula Studio")
         # self.setApplicationVersion("0.1")
         self.setOrganizationName("Ledger Donjon")
@@ -34,6 +45,15 @@ class NebulaStudioApplication(QApplication):
         except ValueError as e:
             logger.error("Error loading settings file: %s", e)
 
+    @property
+    def window_icon(self) -> QIcon:
+        """
+        Returns the icon of the windows, loaded once and shared by all windows.
+        """
+        if self._window_icon is None:
+            self._window_icon = QIcon("icon.png")
+        return self._window_icon
+
     def new_window(self):
         # Create a new instance of NebulaStudio and show it
         window = NebulaStudio()
@@ -45,8 +65,7 @@ class NebulaStudioApplication(QApplication):
         return window
 
     def load_file(self, path: str):
-        if not os.path.isfile(path):
-            raise FileNotFoundError(f"File {path} does not exist")
+        # A missing file is reported by load_yaml with a FileNotFoundError
         if not path.endswith(".yaml"):
             raise ValueError(f"File {path} is not a YAML file")
         if "settings" in path:
@@ -54,31 +73,49 @@ class NebulaStudioApplication(QApplication):
         elif "config" in path:
             self.load_config(path)
 
+    def load_yaml(self, path: str) -> Any:
+        """
+        Parse a YAML file, reusing the previous result if the file did not change.
+        A deep copy is returned so callers may freely modify the document.
+        """
+        stat = os.stat(path)
+        cache = self._yaml_cache
+        entry = cache.get(path)
+        if entry is not None and entry[:2] == (stat.st_mtime, stat.st_size):
+            cache.move_to_end(path)
+            return copy.deepcopy(entry[2])
+
+        with open(path, "rb") as f:
+            document = yaml.load(f, Loader=SafeLoader)
+        cache[path] = (stat.st_mtime, stat.st_size, document)
+        cache.move_to_end(path)
+        if len(cache) > self.YAML_CACHE_SIZE:
+            cache.popitem(last=False)
+        return copy.deepcopy(document)
+
     def load_config(self, config: str, window: "NebulaStudio | None" = None):
         # Load the settings from a YAML file
-        with open(config, "r") as f:
-            _config = yaml.safe_load(f)
-            if not isinstance(_config, list):
-                _config = [_config]
+        _config = self.load_yaml(config)
+        if not isinstance(_config, list):
+            _config = [_config]
 
-            for i in range(len(_config)):
-                win = self.new_window()
-                win.load_config(_config[i])
+        for i in range(len(_config)):
+            win = self.new_window()
+            win.load_config(_config[i])
 
     def load_settings(self, settings: str, window: "NebulaStudio | None" = None):
         # Load the settings from a YAML file
-        with open(settings, "r") as f:
-            _settings = yaml.safe_load(f)
-            if not isinstance(_settings, list):
-                _settings = [_settings]
-
-            for win_setting in _settings:
-                if "title" in win_setting:
-                    title = win_setting["title"]
-                    for win in self.windows:
-                        if win.windowTitle() == title:
-                            win.load_settings(win_setting)
-                            break
+        _settings = self.load_yaml(settings)
+        if not isinstance(_settings, list):
+            _settings = [_settings]
+
+        for win_setting in _settings:
+            if "title" in win_setting:
+                title = win_setting["title"]
+                for win in self.windows:
+                    if win.windowTitle() == title:
+                        win.load_settings(win_setting)
+                        break
 
     @property
     def settings(self) -> list[dict]:
@@ -99,5 +136,8 @@ class NebulaStudioApplication(QApplication):
             if not path:
                 return  # User canceled the dialog
 
+        # Settings refer to images, which must all be loaded
+        for win in self.windows:
+            win.flush_pending_loads()
         with open(path, "w") as f:
             yaml.dump(self.settings, f, default_flow_style=False)
@@ -22,6 +22,18 @@ def normalize_to_8bits(
     return norm_image.astype(numpy.uint8).squeeze()
 
 
+def _balance_values(
+    values: numpy.ndarray, balances: tuple[float, float]
+) -> numpy.ndarray:
+    """
+    Apply the balance to an array of float32 values, in place, and convert it to
+    8 bits.
+    """
+    values -= balances[0] * 255
+    values /= balances[1] - balances[0]
+    return values.clip(min=0, max=255).astype(numpy.uint8)
+
+
 def apply_balances(
     image: numpy.ndarray,
     balances: tuple[float, float],
@@ -35,12 +47,37 @@ def apply_balances(
     if balances[0] == 0.0 and balances[1] == 1.0:
         return image
 
+    if image.dtype == numpy.uint8:
+        # Balance the 256 possible values once, then look the pixels up
+        lut = _balance_values(numpy.arange(256, dtype=numpy.float32), balances)
+        return numpy.take(lut, image)
+
     # Apply the balance to the image
-    image = image.astype(numpy.float32)
-    image -= balances[0] * 255
-    image /= balances[1] - balances[0]
-    image = image.clip(min=0, max=255).astype(numpy.uint8)
-    return image
+    return _balance_values(image.astype(numpy.float32), balances)
+
+
+def qimage_from_8bits(image: numpy.ndarray) -> QImage:
+    """
+    Convert a grayscale or RGB 8-bits numpy array to a QImage.
+    The QImage shares a temporary buffer, it must be copied to be kept.
+    """
+    return QImage(
+        image.tobytes(),
+        image.shape[1],
+        image.shape[0],
+        # Use strides to ensure correct memory layout
+        image.strides[0],
+        QImage.Format.Format_Grayscale8
+        if image.ndim == 2
+        else QImage.Format.Format_RGB888,
+    )
+
+
+def pixmap_from_8bits(image: numpy.ndarray) -> QPixmap:
+    """
+    Convert a grayscale or RGB 8-bits numpy array to a QPixmap.
+    """
+    return QPixmap.fromImage(qimage_from_8bits(image))
 
 
 def make_rgb_pixmap(
@@ -55,18 +92,7 @@ def make_rgb_pixmap(
     image = normalize_to_8bits(
         image, min=minmax[0] if minmax else None, max=minmax[1] if minmax else None
     )
-    image = apply_balances(image, balances)
-    qimage = QImage(
-        image.tobytes(),
-        image.shape[1],
-        image.shape[0],
-        # Use strides to ensure correct memory layout
-        image.strides[0],
-        QImage.Format.Format_Grayscale8
-        if image.ndim == 2
-        else QImage.Format.Format_RGB888,
-    )
-    return QPixmap.fromImage(qimage)
+    return pixmap_from_8bits(apply_balances(image, balances))
 
 
 def construct_diff_ndarray(
@@ -1,7 +1,11 @@
+from collections.abc import Callable
 from typing import TYPE_CHECKING
 import logging
 import numpy
+from functools import partial
+from concurrent.futures import ThreadPoolExecutor
 from PyQt6.QtWidgets import (
+    QApplication,
     QDockWidget,
     QLabel,
     QMainWindow,
@@ -13,7 +17,7 @@ from PyQt6.QtWidgets import (
     QGraphicsPixmapItem,
     QHBoxLayout,
 )
-from PyQt6.QtCore import Qt, QPointF, QRect, QEvent, QPoint
+from PyQt6.QtCore import Qt, QPointF, QRect, QEvent, QEventLoop, QPoint, QTimer
 from PyQt6.QtGui import (
     QColor,
     QKeyEvent,
@@ -33,6 +37,136 @@ from ..diff import make_rgb_pixmap
 from ..utils.colors import LedgerColors
 
 
+def crop_overlap(
+    left: numpy.ndarray, right: numpy.ndarray, x: int, y: int
+) -> tuple[numpy.ndarray, numpy.ndarray] | None:
+    """
+    Returns the overlapping areas of two images of the same size, the right
+    image being shifted by (x, y) pixels, or None if they do not overlap.
+    """
+    height, width = left.shape[:2]
+    if width - abs(x) <= 0 or height - abs(y) <= 0:
+        return None
+    return (
+        left[
+            y if y >= 0 else 0 : height if y >= 0 else height + y,
+            x if x >= 0 else 0 : width if x >= 0 else width + x,
+        ],
+        right[
+            0 if y >= 0 else -y : height - y if y >= 0 else height,
+            0 if x >= 0 else -x : width - x if x >= 0 else width,
+        ],
+    )
+
+
+def alignment_score(
+    left: numpy.ndarray, right: numpy.ndarray, x: int, y: int
+) -> float | None:
+    """
+    Returns the sum of the absolute differences between the overlapping areas
+    of two images, the right image being shifted by (x, y) pixels.
+    """
+    if (cropped := crop_overlap(left, right, x, y)) is None:
+        return None
+    a, b = cropped
+    return float(abs(a.astype(numpy.int64) - b.astype(numpy.int64)).sum())
+
+
+def phase_correlation(a: numpy.ndarray, b: numpy.ndarray) -> tuple[int, int]:
+    """
+    Returns the (x, y) offset such that a[i, j] matches b[i + y, j + x],
+    estimated by FFT phase correlation of two arrays of the same shape.
+    """
+    if a.ndim == 3:
+        a = a.mean(axis=2)
+    if b.ndim == 3:
+        b = b.mean(axis=2)
+    # The peak of the cross-power spectrum of b over a is at the offset of b
+    cross = numpy.fft.rfft2(b) * numpy.fft.rfft2(a).conj()
+    cross /= numpy.abs(cross) + numpy.finfo(numpy.float64).eps
+    corr = numpy.fft.irfft2(cross, s=a.shape)
+    y, x = numpy.unravel_index(numpy.argmax(corr), corr.shape)
+    height, width = corr.shape
+    # The correlation is circular, wrap peaks past the middle to negative offsets
+    return (
+        int(x - width if x > width // 2 else x),
+        int(y - height if y > height // 2 else y),
+    )
+
+
+def search_offset(
+    left: numpy.ndarray,
+    right: numpy.ndarray,
+    x: int,
+    y: int,
+    radius: int,
+    map_scores: Callable = map,
+    between_levels: Callable[[], object] | None = None,
+    tolerance: float = 1e-3,
+) -> tuple[int, int]:
+    """
+    Returns a (dx, dy) offset, within radius pixels, which locally minimizes
+    the alignment score of the right image shifted by (x - dx, y - dy).
+
+    The offset is first estimated by phase correlation of the overlapping
+    areas, and is kept if it aligns the images perfectly. Otherwise a 7x7 grid
+    of offsets is scored around the best offset found so far, with a stride
+    divided by 3 at each level until it reaches one pixel. The one pixel grid
+    then follows the best offset until it stays at its center, or until the
+    best score improves by less than tolerance times its previous value.
+
+    Args:
+        map_scores: The map function used to score a list of offsets, for
+            instance the one of an executor.
+        between_levels: Called between two levels of the grid search.
+        tolerance: Relative improvement of the best score under which the
+            search stops.
+    """
+
+    def score_at(offset: tuple[int, int]) -> float:
+        score = alignment_score(left, right, x - offset[0], y - offset[1])
+        return numpy.inf if score is None else score
+
+    def score_all(offsets: list[tuple[int, int]]):
+        offsets = [offset for offset in offsets if offset not in scores]
+        scores.update(zip(offsets, map_scores(score_at, offsets)))
+
+    # Scores of the offsets already evaluated
+    scores: dict[tuple[int, int], float] = {(0, 0): score_at((0, 0))}
+    if scores[(0, 0)] == 0:
+        return 0, 0
+
+    if (cropped := crop_overlap(left, right, x, y)) is not None:
+        ex, ey = phase_correlation(*cropped)
+        estimate = (max(-radius, min(radius, ex)), max(-radius, min(radius, ey)))
+        score_all([estimate])
+        if scores[estimate] == 0:
+            return estimate
+
+    best = min(scores, key=scores.__getitem__)
+    step = max(1, -(-radius // 3))
+    while True:
+        center, previous = best, scores[best]
+        cx, cy = center
+        score_all(
+            [
+                (cx + i * step, cy + j * step)
+                for i in range(-3, 4)
+                for j in range(-3, 4)
+                if abs(cx + i * step) <= radius and abs(cy + j * step) <= radius
+            ]
+        )
+        best = min(scores, key=scores.__getitem__)
+        if scores[best] == 0:
+            break
+        if step == 1 and (best == center or scores[best] >= previous * (1 - tolerance)):
+            break
+        step = max(1, step // 3)
+        if between_levels is not None:
+            between_levels()
+    return best
+
+
 class NebulaAlignmentView(QGraphicsView):
     """
     A label for displaying alignment information in Nebula Studio.
@@ -301,11 +435,56 @@ class ImageAlignmentWindow(QMainWindow):
 
         # Initialize kernel size for alignment in pixels
         self.kernel_size = 10
+        # Offset of the right image in the last alignment
+        self.cropping_origin = QPointF()
+        # Whether search_best_position is running
+        self._searching = False
         # Store the last cropped arrays currently displayed in the views
         self.cropped_left = None
         self.cropped_right = None
 
+        # Arrow key moves not applied yet, as (image, dx, dy)
+        self._pending_move: tuple[NebulaImage, int, int] | None = None
+        self._move_timer = QTimer(self)
+        self._move_timer.setSingleShot(True)
+        self._move_timer.setInterval(30)
+        self._move_timer.timeout.connect(self._flush_move)
+
+    def move_image(self, image: NebulaImage, dx: int, dy: int):
+        """
+        Moves the image by the given offset. Moves are accumulated and applied
+        with a single alignment when the timer expires, so that auto-repeated
+        keys do not realign the image on each event.
+        """
+        if self._pending_move is not None and self._pending_move[0] is not image:
+            self._flush_move()
+        if self._pending_move is not None:
+            _, x, y = self._pending_move
+            dx, dy = x + dx, y + dy
+        self._pending_move = (image, dx, dy)
+        self._move_timer.start()
+
+    def _flush_move(self):
+        """
+        Applies the accumulated moves and realigns the image.
+        """
+        self._move_timer.stop()
+        if self._pending_move is None:
+            return
+        image, dx, dy = self._pending_move
+        self._pending_move = None
+        image.setPos(image.pos() + QPointF(dx, dy))
+        image.align()
+
     def keyPressEvent(self, a0: QKeyEvent | None) -> None:
+        if a0 is not None and a0.key() not in (
+            Qt.Key.Key_Left,
+            Qt.Key.Key_Right,
+            Qt.Key.Key_Up,
+            Qt.Key.Key_Down,
+        ):
+            # Other keys depend on the current position of the image
+            self._flush_move()
         if a0 is not None and (image := self.image) is not None:
             # Detect if shift is pressed
             if a0.modifiers() & Qt.KeyboardModifier.ShiftModifier:
@@ -345,41 +524,72 @@ class ImageAlignmentWindow(QMainWindow):
 
             # Detect the 'm' key for auto-alignment
             elif a0.key() == Qt.Key.Key_M:
-                best_pos = init_pos = image.pos()
-                res = image.align()
-                if res is None:
-                    logging.getLogger(__name__).warning("Alignment failed")
-                    return super().keyPressEvent(a0)
-
-                for x in range(-self.kernel_size * diff, (self.kernel_size + 1) * diff):
-                    for y in range(
-                        -self.kernel_size * diff, (self.kernel_size + 1) * diff
-                    ):
-                        image.setPos(init_pos.x() + x, init_pos.y() + y)
-                        score = image.align()
-                        if score is not None and score < res:
-                            res = score
-                            best_pos = image.pos()
-                image.setPos(best_pos)
-                image.align()
+                if not self._searching:
+                    self._searching = True
+                    try:
+                        self.search_best_position(image, self.kernel_size * diff)
+                    finally:
+                        self._searching = False
 
             # Detect the left/right/up/down arrow keys
             elif a0.key() == Qt.Key.Key_Left:
-                image.setPos(image.pos().x() - diff, image.pos().y())
-                image.align()
+                self.move_image(image, -diff, 0)
             elif a0.key() == Qt.Key.Key_Right:
-                image.setPos(image.pos().x() + diff, image.pos().y())
-                image.align()
+                self.move_image(image, diff, 0)
             elif a0.key() == Qt.Key.Key_Up:
-                image.setPos(image.pos().x(), image.pos().y() - diff)
-                image.align()
+                self.move_image(image, 0, -diff)
             elif a0.key() == Qt.Key.Key_Down:
-                image.setPos(image.pos().x(), image.pos().y() + diff)
-                image.align()
+                self.move_image(image, 0, diff)
 
         return super().keyPressEvent(a0)
 
+    def search_best_position(self, image: NebulaImage, radius: int):
+        """
+        Moves the image to the offset, within radius pixels of its current
+        position, with the best alignment score, as found by search_offset.
+        The offsets are scored in parallel on snapshots of the image arrays.
+        """
+        init_pos = image.pos()
+        if image.align() is None or self.image_other is None:
+            logging.getLogger(__name__).warning("Alignment failed")
+            return
+
+        left = image.image_to_show
+        right = self.image_other.image_to_show
+        assert left is not None and right is not None, "Image data is not available"
+        origin = self.cropping_origin
+
+        with ThreadPoolExecutor() as executor:
+            dx, dy = search_offset(
+                left,
+                right,
+                int(origin.x()),
+                int(origin.y()),
+                radius,
+                map_scores=executor.map,
+                # Keep the interface painted between two levels, without
+                # handling the input which could move or replace the image
+                between_levels=partial(
+                    QApplication.processEvents,
+                    QEventLoop.ProcessEventsFlag.ExcludeUserInputEvents,
+                ),
+            )
+
+        image.setPos(init_pos.x() + dx, init_pos.y() + dy)
+        image.align()
+
     def closeEvent(self, a0: QCloseEvent | None) -> None:
+        if self._searching:
+            # The image is being moved by search_best_position
+            if a0 is not None:
+                a0.ignore()
+            return
+        # Apply the pending moves without realigning, which would show the window
+        self._move_timer.stop()
+        if self._pending_move is not None:
+            image, dx, dy = self._pending_move
+            self._pending_move = None
+            image.setPos(image.pos() + QPointF(dx, dy))
         if self.image is not None:
             # Reset the image to None when closing the toolbox
             self.image.last_alignment_direction = None
@@ -435,17 +645,11 @@ class ImageAlignmentWindow(QMainWindow):
             )
             return
 
-        cropped_array = numpy_image_l[
-            y if y >= 0 else 0 : height if y >= 0 else height + y,
-            x if x >= 0 else 0 : width if x >= 0 else width + x,
-            :,
-        ]
+        self.cropping_origin = cropping_origin
+        cropped = crop_overlap(numpy_image_l, numpy_image_r, x, y)
+        assert cropped is not None
+        cropped_array, cropped_array2 = cropped
         cropped_pixmap = make_rgb_pixmap(cropped_array, balances=image_left.balances)
-        cropped_array2 = numpy_image_r[
-            0 if y >= 0 else -y : height - y if y >= 0 else height,
-            0 if x >= 0 else -x : width - x if x >= 0 else width,
-            :,
-        ]
         cropped_pixmap2 = make_rgb_pixmap(cropped_array2, balances=image_right.balances)
         # Cache the cropped arrays for subsequent refinement
         self.cropped_left = cropped_array
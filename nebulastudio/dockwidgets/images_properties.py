@@ -1,6 +1,10 @@
 import os
+from functools import partial
+from contextlib import ExitStack, contextmanager
+from collections.abc import Callable
 from typing import TYPE_CHECKING
-from PyQt6.QtCore import Qt
+from PyQt6.QtCore import Qt, QTimer, QSignalBlocker, QPointF, pyqtSignal
+from PyQt6.QtGui import QAction
 from PyQt6.QtWidgets import (
     QGroupBox,
     QHBoxLayout,
@@ -14,13 +18,84 @@ from PyQt6.QtWidgets import (
     QVBoxLayout,
     QWidget,
 )
-from ..nebulaimage import NebulaImage, NebulaImageGroup, make_rgb_pixmap
+from ..nebulaimage import NebulaImage, NebulaImageGroup
+from ..diff import make_rgb_pixmap
 from ..viewer import Viewer
 
 if TYPE_CHECKING:
     from ..nebulastudio import NebulaStudio
 
 
+class LinkedSliderSpin(QWidget):
+    """
+    A slider and a spin box controlling the same value.
+    """
+
+    # Emitted once per change, by whichever of the two controls was used
+    valueChanged = pyqtSignal(float)
+    sliderReleased = pyqtSignal()
+
+    def __init__(
+        self, value_range: tuple[int, int], value: int, suffix: str, tooltip: str
+    ):
+        super().__init__()
+        self.slider = slider = QSlider(Qt.Orientation.Horizontal)
+        slider.setRange(*value_range)
+        slider.setSingleStep(1)
+        slider.setValue(value)
+        slider.setToolTip(tooltip)
+        self.spinbox = spinbox = QDoubleSpinBox()
+        spinbox.setAccelerated(True)
+        spinbox.setKeyboardTracking(False)
+        spinbox.setRange(*value_range)
+        spinbox.setSingleStep(1)
+        spinbox.setValue(value)
+        spinbox.setSuffix(suffix)
+        spinbox.setToolTip(tooltip)
+        hbox = QHBoxLayout(self)
+        hbox.setContentsMargins(0, 0, 0, 0)
+        hbox.addWidget(slider)
+        hbox.addWidget(spinbox)
+        slider.valueChanged.connect(self._on_slider_changed)
+        spinbox.valueChanged.connect(self._on_spinbox_changed)
+        slider.sliderReleased.connect(self.sliderReleased)
+
+    def _on_slider_changed(self, value: int):
+        with QSignalBlocker(self.spinbox):
+            self.spinbox.setValue(value)
+        self.valueChanged.emit(float(value))
+
+    def _on_spinbox_changed(self, value: float):
+        with QSignalBlocker(self.slider):
+            self.slider.setValue(int(value))
+        self.valueChanged.emit(value)
+
+    def value(self) -> float:
+        """
+        Returns the value of the spin box, which is not rounded.
+        """
+        return self.spinbox.value()
+
+    def setValue(self, value: float):
+        """
+        Sets the value of both controls, without emitting valueChanged. Controls
+        already showing the value are left untouched.
+        """
+        # Spin boxes round their value to the displayed decimals
+        if abs(self.spinbox.value() - value) >= 0.5 * 10 ** -self.spinbox.decimals():
+            with QSignalBlocker(self.spinbox):
+                self.spinbox.setValue(value)
+        if self.slider.value() != int(value):
+            with QSignalBlocker(self.slider):
+                self.slider.setValue(int(value))
+
+    def isSliderDown(self) -> bool:
+        """
+        Returns whether the slider is being dragged.
+        """
+        return self.slider.isSliderDown()
+
+
 class ImagePropertiesPanel(QGroupBox):
     """
     A panel for adjusting an image in Nebula Studio.
@@ -35,109 +110,75 @@ class ImagePropertiesPanel(QGroupBox):
         """
         super().__init__()
         self.setLayout(form := QFormLayout())
-        self.opacity_slider = slider = QSlider(Qt.Orientation.Horizontal)
-        self.opacity_spinner = spinbox = QDoubleSpinBox()
-        slider.setToolTip("Adjust the opacity of the image")
-        slider.setValue(100)
-        slider.setRange(0, 100)
-        spinbox.setRange(0, 100)
-        spinbox.setSingleStep(1)
-        spinbox.setValue(100)
-        spinbox.setSuffix("%")
-        spinbox.setToolTip("Adjust the opacity of the image")
-        hbox = QHBoxLayout()
-        hbox.addWidget(slider)
-        hbox.addWidget(spinbox)
+        self.form = form
 
         self.opacity_button = w = QPushButton("Opacity")
-        form.addRow(w, hbox)
         w.setCheckable(True)
         w.setChecked(True)
         w.clicked.connect(self._on_opacity_button_clicked)
-        slider.valueChanged.connect(self._on_opacity_changed)
-        spinbox.valueChanged.connect(self._on_opacity_changed)
+        self.opacity_control = self._make_slider_row(
+            w,
+            (0, 100),
+            100,
+            "%",
+            "Adjust the opacity of the image",
+            self._on_opacity_changed,
+        )
 
-        self.white_level_slider = slider = QSlider(Qt.Orientation.Horizontal)
-        slider.setRange(0, 100)
-        slider.setSingleStep(1)
-        slider.setValue(100)
-        slider.setToolTip("Adjust the white balance of the image")
-        self.white_level_spinner = spinbox = QDoubleSpinBox()
-        spinbox.setRange(0, 100)
-        spinbox.setSingleStep(1)
-        spinbox.setValue(100)
-        spinbox.setSuffix("%")
-        spinbox.setToolTip("Adjust the white balance of the image")
-        hbox = QHBoxLayout()
-        hbox.addWidget(slider)
-        hbox.addWidget(spinbox)
-        form.addRow("White Balance", hbox)
-        slider.valueChanged.connect(self._on_white_level_changed)
-        spinbox.valueChanged.connect(self._on_white_level_changed)
+        self.white_level_control = self._make_slider_row(
+            "White Balance",
+            (0, 100),
+            100,
+            "%",
+            "Adjust the white balance of the image",
+            self._on_white_level_changed,
+        )
+        self.white_level_control.sliderReleased.connect(
+            lambda: self._on_white_level_changed(self.white_level_control.value())
+        )
 
-        self.black_level_slider = slider = QSlider(Qt.Orientation.Horizontal)
-        slider.setRange(0, 100)
-        slider.setSingleStep(1)
-        slider.setValue(0)
-        slider.setToolTip("Adjust the black level of the image")
-        self.black_level_spinner = spinbox = QDoubleSpinBox()
-        spinbox.setRange(0, 100)
-        spinbox.setSingleStep(1)
-        spinbox.setValue(0)
-        spinbox.setSuffix("%")
-        spinbox.setToolTip("Adjust the black level of the image")
-        hbox = QHBoxLayout()
-        hbox.addWidget(slider)
-        hbox.addWidget(spinbox)
-        form.addRow("Black Level", hbox)
-        slider.valueChanged.connect(self._on_black_level_changed)
-        spinbox.valueChanged.connect(self._on_black_level_changed)
+        self.black_level_control = self._make_slider_row(
+            "Black Level",
+            (0, 100),
+            0,
+            "%",
+            "Adjust the black level of the image",
+            self._on_black_level_changed,
+        )
+        self.black_level_control.sliderReleased.connect(
+            lambda: self._on_black_level_changed(self.black_level_control.value())
+        )
 
         # Constant Offset
 
-        self.offset_x_slider = slider = QSlider(Qt.Orientation.Horizontal)
-        slider.setRange(-100, 100)
-        slider.setSingleStep(1)
-        slider.setValue(0)
-        slider.setToolTip("Adjust the X offset of the image")
-        self.offset_x_spinner = spinbox = QDoubleSpinBox()
-        spinbox.setRange(-100, 100)
-        spinbox.setSingleStep(1)
-        spinbox.setValue(0)
-        spinbox.setSuffix("px")
-        spinbox.setToolTip("Adjust the X offset of the image")
-        hbox = QHBoxLayout()
-        hbox.addWidget(slider)
-        hbox.addWidget(spinbox)
-        form.addRow("X Offset", hbox)
-        slider.valueChanged.connect(self._on_pos_x_changed)
-        slider.sliderReleased.connect(self.recenter_pos_sliders)
-        spinbox.valueChanged.connect(self._on_pos_x_changed)
-
-        self.offset_y_slider = slider = QSlider(Qt.Orientation.Horizontal)
-        slider.setRange(-100, 100)
-        slider.setSingleStep(1)
-        slider.setValue(0)
-        slider.setToolTip("Adjust the Y offset of the image")
-        self.offset_y_spinner = spinbox = QDoubleSpinBox()
-        spinbox.setRange(-100, 100)
-        spinbox.setSingleStep(1)
-        spinbox.setValue(0)
-        spinbox.setSuffix("px")
-        spinbox.setToolTip("Adjust the Y offset of the image")
-        hbox = QHBoxLayout()
-        hbox.addWidget(slider)
-        hbox.addWidget(spinbox)
-        form.addRow("Y Offset", hbox)
-        slider.valueChanged.connect(self._on_pos_y_changed)
-        slider.sliderReleased.connect(self.recenter_pos_sliders)
-        spinbox.valueChanged.connect(self._on_pos_y_changed)
+        self.offset_x_control = self._make_slider_row(
+            "X Offset",
+            (-100, 100),
+            0,
+            "px",
+            "Adjust the X offset of the image",
+            self._on_pos_x_changed,
+        )
+        self.offset_x_control.sliderReleased.connect(self._flush_pending)
+        self.offset_x_control.sliderReleased.connect(self.recenter_pos_sliders)
+
+        self.offset_y_control = self._make_slider_row(
+            "Y Offset",
+            (-100, 100),
+            0,
+            "px",
+            "Adjust the Y offset of the image",
+            self._on_pos_y_changed,
+        )
+        self.offset_y_control.sliderReleased.connect(self._flush_pending)
+        self.offset_y_control.sliderReleased.connect(self.recenter_pos_sliders)
 
         self.image_url = w = QLabel()
         form.addRow("Name", w)
         self.reference_url = w = QLabel()
         form.addRow("Reference", w)
-        self.form = form
+        # Row of the reference, hidden for images without reference
+        self._reference_row = form.rowCount() - 1
         self.setEnabled(False)
 
         self.average_button = QPushButton("Remove Shading")
@@ -161,7 +202,62 @@ class ImagePropertiesPanel(QGroupBox):
         self.export_button.clicked.connect(self.on_export_button_clicked)
         self.form.addRow("Export stitch image", self.export_button)
 
+        # Window showing the average image, and the array it displays
+        self.average_window: QLabel | None = None
+        self._average_image = None
+
         self._image: NebulaImage | None = None
+        # The image and the images of its group, built by the images property,
+        # with the group and its version when the list was built
+        self._images_cache: list[NebulaImage] | None = None
+        self._images_group: NebulaImageGroup | None = None
+        self._images_version = 0
+
+        # Controls synchronized with the image by update_ui
+        self._controls = (
+            self.black_level_control,
+            self.white_level_control,
+            self.opacity_control,
+            self.offset_x_control,
+            self.offset_y_control,
+            self.opacity_button,
+        )
+        # Depth of nested _batched contexts, and whether update_ui was called
+        # inside them
+        self._batch_depth = 0
+        self._ui_dirty = False
+
+        # Latest values of the controls, applied to the images at most once
+        # per frame by _flush_pending
+        self._pending: dict[str, int | float] = {}
+        self._flush_timer = QTimer(self)
+        self._flush_timer.setSingleShot(True)
+        self._flush_timer.setInterval(16)
+        self._flush_timer.timeout.connect(self._flush_pending)
+        for control in (
+            self.opacity_control,
+            self.white_level_control,
+            self.black_level_control,
+        ):
+            control.sliderReleased.connect(self._flush_pending)
+
+    def _make_slider_row(
+        self,
+        label: str | QWidget,
+        value_range: tuple[int, int],
+        value: int,
+        suffix: str,
+        tooltip: str,
+        on_changed: Callable[[float], None],
+    ) -> LinkedSliderSpin:
+        """
+        Adds a row to the form with a slider and a spin box controlling the same
+        property, connected to the given handler.
+        """
+        control = LinkedSliderSpin(value_range, value, suffix, tooltip)
+        self.form.addRow(label, control)
+        control.valueChanged.connect(on_changed)
+        return control
 
     def on_export_button_clicked(self):
         """
@@ -190,13 +286,15 @@ class ImagePropertiesPanel(QGroupBox):
 
         image.apply_average(checked)
 
-        # Show the result in a new window
+        # Show the result in a separate window
         if image.average_image is not None:
-            average_image = make_rgb_pixmap(image.average_image)
-            self.average_window = QLabel()
-            self.average_window.setPixmap(average_image)
-            self.average_window.show()
+            if self.average_window is None:
+                self.average_window = QLabel(self, Qt.WindowType.Window)
+            if image.average_image is not self._average_image:
+                self._average_image = image.average_image
+                self.average_window.setPixmap(make_rgb_pixmap(image.average_image))
             self.average_window.setWindowTitle(f"Average of {image.name}")
+            self.average_window.show()
 
     @property
     def image(self) -> NebulaImage | None:
@@ -210,6 +308,17 @@ class ImagePropertiesPanel(QGroupBox):
         """
         Sets the image associated with this panel.
         """
+        with self._batched():
+            self._set_image(value)
+
+    def _set_image(self, value: NebulaImage | None):
+        """
+        Sets the image associated with this panel, with the signals of the
+        controls blocked.
+        """
+        # Pending changes belong to the previous image
+        self._flush_pending()
+        self._images_cache = None
         if value is None:
             self._image = None
             self.hide()
@@ -223,16 +332,12 @@ class ImagePropertiesPanel(QGroupBox):
 
         self.image_url.setText(self._image.name)
         self.image_url.setToolTip(self._image.pattern)
-        row = self.form.getWidgetPosition(self.reference_url)
-
         if self._image.reference_url is None:
-            if row is not None and row[0] is not None:
-                self.form.setRowVisible(row[0], False)
+            self.form.setRowVisible(self._reference_row, False)
         else:
             self.reference_url.setText(os.path.basename(self._image.reference_url))
             self.reference_url.setToolTip(self._image.reference_pattern)
-            if row is not None and row[0] is not None:
-                self.form.setRowVisible(row[0], True)
+            self.form.setRowVisible(self._reference_row, True)
 
         self.update_ui()
 
@@ -241,14 +346,26 @@ class ImagePropertiesPanel(QGroupBox):
         """
         Returns a list of images associated with this panel.
         """
-        if (img := self.image) is None:
-            return []
-        return [img] + (list(img.images) if isinstance(img, NebulaImageGroup) else [])
+        if self._images_cache is None or (
+            (group := self._images_group) is not None
+            and group.images_version != self._images_version
+        ):
+            if (img := self.image) is None:
+                return []
+            if isinstance(img, NebulaImageGroup):
+                self._images_group = img
+                self._images_version = img.images_version
+                self._images_cache = [img, *img.images]
+            else:
+                self._images_group = None
+                self._images_cache = [img]
+        return self._images_cache
 
     def _on_opacity_button_clicked(self, checked: bool):
         """
         Handles the opacity button click event.
         """
+        self.opacity_control.setValue(100 if checked else 0)
         self._on_opacity_changed(100 if checked else 0)
 
     def _on_opacity_changed(self, value: int | float):
@@ -258,12 +375,8 @@ class ImagePropertiesPanel(QGroupBox):
         Args:
             value (int | float): The new opacity value.
         """
-        for image in self.images:
-            image.setOpacity(value / 100.0)
-            image.update()
-            if scene := image.scene():
-                scene.update()
-        self.update_ui()
+        self._pending["opacity"] = value
+        self._flush_timer.start()
 
     def _on_white_level_changed(self, value: int | float):
         """
@@ -272,12 +385,11 @@ class ImagePropertiesPanel(QGroupBox):
         Args:
             value (int | float): The new white balance value.
         """
-        for image in self.images:
-            image.balances = (image.balances[0], value / 100.0)
-            image.update_pixmap()
-            if scene := image.scene():
-                scene.update()
-        self.update_ui()
+        if self.white_level_control.isSliderDown():
+            # The pixmaps are rebuilt when the slider is released
+            return
+        self._pending["white_level"] = value
+        self._flush_timer.start()
 
     def _on_black_level_changed(self, value: int | float):
         """
@@ -286,12 +398,11 @@ class ImagePropertiesPanel(QGroupBox):
         Args:
             value (int): The new black level value.
         """
-        for image in self.images:
-            image.balances = (value / 100.0, image.balances[1])
-            image.update_pixmap()
-            if scene := image.scene():
-                scene.update()
-        self.update_ui()
+        if self.black_level_control.isSliderDown():
+            # The pixmaps are rebuilt when the slider is released
+            return
+        self._pending["black_level"] = value
+        self._flush_timer.start()
 
     def _on_pos_x_changed(self, value: int | float):
         """
@@ -300,15 +411,8 @@ class ImagePropertiesPanel(QGroupBox):
         Args:
             value (int | float): The new X offset value.
         """
-        for image in self.images:
-            image.setPos(float(value), image.pos().y())
-            image.update()
-            if scene := image.scene():
-                scene.update()
-        self.update_ui()
-
-        # TODO REMOVE
-        self.images[0].align()
+        self._pending["pos_x"] = value
+        self._flush_timer.start()
 
     def _on_pos_y_changed(self, value: int | float):
         """
@@ -317,20 +421,88 @@ class ImagePropertiesPanel(QGroupBox):
         Args:
             value (int): The new Y offset value.
         """
-        for image in self.images:
-            image.setPos(image.pos().x(), float(value))
-            image.update()
-            if scene := image.scene():
-                scene.update()
-        self.update_ui()
+        self._pending["pos_y"] = value
+        self._flush_timer.start()
+
+    def _flush_pending(self):
+        """
+        Applies the latest pending value of each property to the images.
+        """
+        self._flush_timer.stop()
+        pending, self._pending = self._pending, {}
+        if not pending or not (images := self.images):
+            return
 
-        # TODO REMOVE
-        self.images[0].align()
+        pos_x, pos_y = pending.get("pos_x"), pending.get("pos_y")
+        # Position shared by all the images when both coordinates changed
+        pos = None if pos_x is None or pos_y is None else QPointF(pos_x, pos_y)
+
+        # setOpacity, setPos and setPixmap schedule the repaint of the area
+        # covered by each item, so the scenes are not invalidated
+        for image in images:
+            if "opacity" in pending:
+                image.setOpacity(pending["opacity"] / 100.0)
+            if pos is not None:
+                image.setPos(pos)
+            elif pos_x is not None:
+                image.setPos(pos_x, image.pos().y())
+            elif pos_y is not None:
+                image.setPos(image.pos().x(), pos_y)
+            if "black_level" in pending or "white_level" in pending:
+                black_level, white_level = image.balances
+                if "black_level" in pending:
+                    black_level = pending["black_level"] / 100.0
+                if "white_level" in pending:
+                    white_level = pending["white_level"] / 100.0
+                # Large images are balanced without blocking the interface,
+                # see NebulaImage.BACKGROUND_BALANCE_PIXELS
+                image.set_balances((black_level, white_level), background=True)
+
+        # The slider and spin box of each property are synchronized by its
+        # control
+        if "opacity" in pending:
+            self.opacity_button.setChecked(pending["opacity"] > 0)
+        if ("pos_x" in pending or "pos_y" in pending) and not (
+            self.offset_x_control.isSliderDown() or self.offset_y_control.isSliderDown()
+        ):
+            self.recenter_pos_sliders()
+
+    @staticmethod
+    def _block_signals(*widgets: QWidget) -> ExitStack:
+        """
+        Returns a context blocking the signals of the given widgets, then
+        restoring their previous state.
+        """
+        stack = ExitStack()
+        for w in widgets:
+            stack.enter_context(QSignalBlocker(w))
+        return stack
+
+    @contextmanager
+    def _batched(self):
+        """
+        Blocks the signals of the controls for the duration of the context.
+        Contexts can be nested, and update_ui calls made inside them are
+        deferred to the exit of the outermost one.
+        """
+        outermost = self._batch_depth == 0
+        self._batch_depth += 1
+        try:
+            with self._block_signals(*self._controls) if outermost else ExitStack():
+                yield
+        finally:
+            self._batch_depth -= 1
+        if outermost and self._ui_dirty:
+            self._ui_dirty = False
+            self.update_ui()
 
     def update_ui(self):
         """
         Updates the UI of the panel.
         """
+        if self._batch_depth:
+            self._ui_dirty = True
+            return
         if self.image is None:
             self.setEnabled(False)
             self.setTitle("No Image")
@@ -341,37 +513,16 @@ class ImagePropertiesPanel(QGroupBox):
         white_level = self.image.balances[1]
         black_level = self.image.balances[0]
 
-        self.black_level_slider.blockSignals(True)
-        self.black_level_spinner.blockSignals(True)
-        self.white_level_slider.blockSignals(True)
-        self.white_level_spinner.blockSignals(True)
-        self.opacity_slider.blockSignals(True)
-        self.opacity_spinner.blockSignals(True)
-        self.offset_x_spinner.blockSignals(True)
-        self.offset_y_spinner.blockSignals(True)
-        self.opacity_button.blockSignals(True)
-
-        self.opacity_button.setChecked(opacity > 0)
-        self.black_level_spinner.setValue(black_level * 100)
-        self.black_level_slider.setValue(int(black_level * 100))
-        self.white_level_spinner.setValue(white_level * 100)
-        self.white_level_slider.setValue(int(white_level * 100))
-        self.opacity_spinner.setValue(opacity * 100)
-        self.opacity_slider.setValue(int(opacity * 100))
-        self.offset_x_spinner.setValue(self.image.pos().x())
-        self.offset_y_spinner.setValue(self.image.pos().y())
-
-        self.recenter_pos_sliders()
-
-        self.opacity_slider.blockSignals(False)
-        self.opacity_spinner.blockSignals(False)
-        self.white_level_slider.blockSignals(False)
-        self.white_level_spinner.blockSignals(False)
-        self.black_level_slider.blockSignals(False)
-        self.black_level_spinner.blockSignals(False)
-        self.offset_x_spinner.blockSignals(False)
-        self.offset_y_spinner.blockSignals(False)
-        self.opacity_button.blockSignals(False)
+        with self._batched():
+            if self.opacity_button.isChecked() != (opacity > 0):
+                self.opacity_button.setChecked(opacity > 0)
+            self.black_level_control.setValue(black_level * 100)
+            self.white_level_control.setValue(white_level * 100)
+            self.opacity_control.setValue(opacity * 100)
+            # Recenter first, so that the offset sliders can show the position
+            self.recenter_pos_sliders()
+            self.offset_x_control.setValue(self.image.pos().x())
+            self.offset_y_control.setValue(self.image.pos().y())
 
         self.average_button.setEnabled(isinstance(self.image, NebulaImageGroup))
 
@@ -384,15 +535,13 @@ class ImagePropertiesPanel(QGroupBox):
         pos_x = int(self.image.pos().x())
         pos_y = int(self.image.pos().y())
 
-        self.offset_x_slider.blockSignals(True)
-        self.offset_y_slider.blockSignals(True)
-
-        self.offset_x_slider.setRange(pos_x - 100, pos_x + 100)
-        # self.offset_x_slider.setValue(pos_x)
-        self.offset_y_slider.setRange(pos_y - 100, pos_y + 100)
-        # self.offset_y_slider.setValue(pos_y)
-        self.offset_x_slider.blockSignals(False)
-        self.offset_y_slider.blockSignals(False)
+        slider_x = self.offset_x_control.slider
+        slider_y = self.offset_y_control.slider
+        with QSignalBlocker(slider_x), QSignalBlocker(slider_y):
+            slider_x.setRange(pos_x - 100, pos_x + 100)
+            # slider_x.setValue(pos_x)
+            slider_y.setRange(pos_y - 100, pos_y + 100)
+            # slider_y.setValue(pos_y)
 
 
 class ImagesPropertiesDockWidget(QDockWidget):
@@ -410,6 +559,8 @@ class ImagesPropertiesDockWidget(QDockWidget):
 
         # Dropdown list to select the image
         self.image_selector = QPushButton("Selection")
+        # Number of rows of the grid when the selector menu was built
+        self._selector_rows: int | None = None
         self.setWindowFlag(Qt.WindowType.WindowTitleHint, True)
         self.setWidget(w := QWidget())
         w.setLayout(vbox := QVBoxLayout())
@@ -431,9 +582,17 @@ class ImagesPropertiesDockWidget(QDockWidget):
     def update_image_selector(self):
         """
         Updates the image selector with the list of images in the Nebula Studio.
+        Only the row submenus depend on the grid, the entries of the menus are
+        built from the current viewers and scenarios each time they are shown.
         """
+        old_menu = self.image_selector.menu()
+        if old_menu is not None and self._selector_rows == self.nebula_studio.rows:
+            return
+        self._selector_rows = self.nebula_studio.rows
+        if old_menu is not None:
+            old_menu.deleteLater()
         menu = QMenu(self.image_selector)
-        row_menu = viewers = QMenu(menu)
+        viewers = QMenu(menu)
         viewers.setTitle("By position")
         menu.addMenu(viewers)
         patterns = QMenu(menu)
@@ -441,48 +600,86 @@ class ImagesPropertiesDockWidget(QDockWidget):
         menu.addMenu(patterns)
         self.image_selector.setMenu(menu)
 
-        separate_rows = self.nebula_studio.rows > 5
-        for i in range(self.nebula_studio.rows):
-            if separate_rows:
+        rows = range(self.nebula_studio.rows)
+        if self.nebula_studio.rows > 5:
+            for i in rows:
                 row_menu = QMenu(viewers)
                 row_menu.setTitle(f"Row {i}")
                 viewers.addMenu(row_menu)
+                row_menu.aboutToShow.connect(
+                    partial(self._populate_viewers, row_menu, range(i, i + 1))
+                )
+        else:
+            viewers.aboutToShow.connect(
+                partial(self._populate_viewers, viewers, rows, False)
+            )
+        patterns.aboutToShow.connect(partial(self._populate_scenarios, patterns))
+
+    @staticmethod
+    def _clear_menu(menu: QMenu):
+        """
+        Removes the entries of the menu, deleting its submenus.
+        """
+        for action in menu.actions():
+            if (submenu := action.menu()) is not None:
+                submenu.deleteLater()
+        menu.clear()
 
+    def _populate_viewers(self, menu: QMenu, rows: range, by_column: bool = True):
+        """
+        Fills the menu with a submenu for each viewer in the given rows.
+        """
+        self._clear_menu(menu)
+        for i in rows:
             for j in range(self.nebula_studio.columns):
                 viewer = self.nebula_studio.viewer_at(i, j)
                 if not isinstance(viewer, Viewer):
                     continue
                 group = viewer.group
-                viewer_menu = QMenu(row_menu)
-                row_menu.addMenu(viewer_menu)
-                viewer_menu.setTitle(
-                    f"Column {j}" if separate_rows else group.groupname
-                )
-                viewer_menu.addAction(
-                    "All images",
-                    lambda img=group: self.on_image_selected(img),
+                viewer_menu = QMenu(menu)
+                viewer_menu.setTitle(f"Column {j}" if by_column else group.groupname)
+                menu.addMenu(viewer_menu)
+                viewer_menu.aboutToShow.connect(
+                    partial(self._populate_images, viewer_menu, group)
                 )
-                viewer_menu.addSeparator()
-                for image in group.images:
-                    viewer_menu.addAction(
-                        image.name,
-                        lambda img=image: self.on_image_selected(img),
-                    )
 
+    def _populate_scenarios(self, menu: QMenu):
+        """
+        Fills the menu with a submenu for each scenario.
+        """
+        self._clear_menu(menu)
         for scenario in self.nebula_studio.scenarios.values():
-            scenario_menu = QMenu(patterns)
+            scenario_menu = QMenu(menu)
             scenario_menu.setTitle(scenario.name)
-            scenario_menu.addAction(
-                "All images",
-                lambda img=scenario: self.on_image_selected(img),
+            menu.addMenu(scenario_menu)
+            scenario_menu.aboutToShow.connect(
+                partial(self._populate_images, scenario_menu, scenario)
             )
-            scenario_menu.addSeparator()
-            for image in scenario.images:
-                scenario_menu.addAction(
-                    image.name,
-                    lambda img=image: self.on_image_selected(img),
-                )
-                patterns.addMenu(scenario_menu)
+
+    def _populate_images(self, menu: QMenu, group: NebulaImageGroup):
+        """
+        Fills the menu with an entry for the whole group followed by an entry
+        for each of its images.
+        """
+        self._clear_menu(menu)
+        action = menu.addAction("All images")
+        assert action is not None
+        action.setData(group)
+        action.triggered.connect(self._menu_action_triggered)
+        menu.addSeparator()
+        for image in group.images:
+            action = menu.addAction(image.name)
+            assert action is not None
+            action.setData(image)
+            action.triggered.connect(self._menu_action_triggered)
+
+    def _menu_action_triggered(self):
+        """
+        Selects the image stored in the data of the triggered menu action.
+        """
+        action = self.sender()
+        assert isinstance(action, QAction)
+        self.on_image_selected(action.data())
 
     def on_image_selected(self, image: NebulaImage):
         """
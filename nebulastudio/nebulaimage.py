@@ -1,4 +1,4 @@
-from PyQt6.QtGui import QPixmap
+from PyQt6.QtGui import QPixmap, QImage
 from PyQt6.QtWidgets import (
     QGraphicsItem,
     QGraphicsSceneMouseEvent,
@@ -7,14 +7,16 @@ from PyQt6.QtWidgets import (
     QMenu,
     QFileDialog,
 )
-from PyQt6.QtCore import Qt, QPointF
+from PyQt6.QtCore import Qt, QPointF, QObject, QRunnable, QThreadPool, pyqtSignal
+from PyQt6 import sip
 from PIL import Image
 import os
 import numpy
 
 
 from .diff import (
-    make_rgb_pixmap,
+    pixmap_from_8bits,
+    qimage_from_8bits,
     construct_diff_ndarray,
     normalize_to_8bits,
     apply_balances,
@@ -27,17 +29,90 @@ if TYPE_CHECKING:
     from .viewer import Viewer
 
 
+class BalanceSignals(QObject):
+    """
+    Signals of a BalanceWorker.
+    """
+
+    # Generation of the update and balanced image
+    done = pyqtSignal(int, QImage)
+
+
+class BalanceWorker(QRunnable):
+    """
+    Balances an 8-bits image in a thread pool.
+    """
+
+    def __init__(
+        self, image: numpy.ndarray, balances: tuple[float, float], generation: int
+    ):
+        super().__init__()
+        self.image = image
+        self.balances = balances
+        self.generation = generation
+        self.signals = BalanceSignals()
+
+    def run(self):
+        balanced = apply_balances(self.image, self.balances)
+        # Detach the QImage from the temporary buffer before leaving the thread
+        qimage = qimage_from_8bits(balanced).copy()
+        self.signals.done.emit(self.generation, qimage)
+
+
+class LoadSignals(QObject):
+    """
+    Signals of a LoadWorker.
+    """
+
+    # Index of the load, decoded image and reference image, or None if the
+    # files could not be decoded
+    done = pyqtSignal(int, object, object)
+
+
+class LoadWorker(QRunnable):
+    """
+    Decodes an image file and its reference file in a thread pool.
+    """
+
+    def __init__(self, index: int, filename: str, reference: str | None = None):
+        super().__init__()
+        self.index = index
+        self.filename = filename
+        self.reference = reference
+        self.signals = LoadSignals()
+
+    def run(self):
+        image = reference = None
+        try:
+            image = NebulaImage.file_to_numpy(self.filename)
+            reference = NebulaImage.file_to_numpy(self.reference)
+        except Exception:
+            logging.getLogger(__name__).exception(
+                "Failed to load image from file: %s", self.filename
+            )
+            image = reference = None
+        finally:
+            # Always report back, the caller waits for every load
+            self.signals.done.emit(self.index, image, reference)
+
+
 class NebulaImage(QGraphicsPixmapItem):
     """
     A class representing an image in Nebula Studio.
     """
 
+    # Number of pixels from which a background update is balanced in the
+    # thread pool, smaller images are balanced at once
+    BACKGROUND_BALANCE_PIXELS = 1024 * 1024
+
     def __init__(
         self,
         image_url: str | None = None,
         reference_url: str | None = None,
         pattern: str | None = None,
         reference_pattern: str | None = None,
+        image: numpy.ndarray | None = None,
+        reference_image: numpy.ndarray | None = None,
     ):
         """
         Initializes the NebulaImage instance.
@@ -45,6 +120,9 @@ class NebulaImage(QGraphicsPixmapItem):
         Args:
             image_url (str): The URL of the image.
             pattern (str): The pattern of filename it is from.
+            image (numpy.ndarray): The already decoded image, to not load it
+                again from image_url.
+            reference_image (numpy.ndarray): The already decoded reference image.
         """
         super().__init__()
         self.image_url = image_url
@@ -57,12 +135,20 @@ class NebulaImage(QGraphicsPixmapItem):
         self.average_image = None
         self.diff_image = None
         self._balances = (0.0, 1.0)
+        # Image to show normalized to 8 bits, with the arrays and min and max
+        # values it was computed from
+        self._normalized: numpy.ndarray | None = None
+        self._normalized_sources: tuple | None = None
+        # Incremented on each pixmap update, to discard outdated background ones
+        self._pixmap_generation = 0
 
         # Used to store the min and max values of the whole scenario for normalization
         self.minmax: tuple[int, int] | None = None
 
         # Populate image, reference image and diff image objects
-        if self.image_url is not None:
+        if image is not None:
+            self.set_arrays(image, reference_image)
+        elif self.image_url is not None:
             self.load_files(self.image_url, self.reference_url)
         self.update_pixmap()
 
@@ -84,23 +170,33 @@ class NebulaImage(QGraphicsPixmapItem):
             raise FileNotFoundError(f"File {filename} does not exist")
 
         if filename.endswith(".npy"):
-            # Load the image from the numpy file
-            return numpy.load(filename).astype(numpy.uint64)
-
-        image = Image.open(filename)
-        # Convert the image in grayscale if the image has only one channel
-        if image.mode in ("L", "1", "P"):
-            image = image.convert("L")  # Convert to grayscale
-        else:
-            image = image.convert("RGB")
-
-        return numpy.array(image)
+            # Map the numpy file and copy it once, while converting it
+            return numpy.load(filename, mmap_mode="r").astype(numpy.uint64)
+
+        with Image.open(filename) as image:
+            # Convert the image in grayscale if the image has only one channel
+            mode = "L" if image.mode in ("L", "1", "P") else "RGB"
+            if image.mode != mode:
+                # The conversion decodes and copies the image, skip it when the
+                # image is already in the expected mode
+                image = image.convert(mode)
+            return numpy.array(image)
 
     def load_files(self, filename: str, reference: str | None = None):
-        self.image = self.file_to_numpy(filename)
-        self.reference_image = self.file_to_numpy(reference)
-        if self.image is not None and self.reference_image is not None:
-            self.diff_image = construct_diff_ndarray(self.image, self.reference_image)
+        self.set_arrays(self.file_to_numpy(filename), self.file_to_numpy(reference))
+
+    def set_arrays(
+        self,
+        image: numpy.ndarray | None,
+        reference_image: numpy.ndarray | None = None,
+    ):
+        """
+        Sets the image and reference image, and computes their diff.
+        """
+        self.image = image
+        self.reference_image = reference_image
+        if image is not None and reference_image is not None:
+            self.diff_image = construct_diff_ndarray(image, reference_image)
 
     def update_tooltip(self):
         self.setToolTip(
@@ -138,20 +234,55 @@ class NebulaImage(QGraphicsPixmapItem):
             image_to_show = self.image
         return image_to_show
 
-    def update_pixmap(self):
+    @property
+    def normalized_image(self) -> numpy.ndarray | None:
         """
-        Updates the pixmap with the numpy image to show.
+        Returns the image to show normalized to 8 bits. It is cached until the
+        arrays it is computed from or the min and max values are replaced.
         """
-        if (img := self.image_to_show) is not None:
-            self.setPixmap(
-                make_rgb_pixmap(
-                    img,
-                    balances=self.balances,
-                    minmax=self.minmax,
+        sources = (self.image, self.diff_image, self.average_image, self.minmax)
+        cached = self._normalized_sources
+        if cached is None or any(a is not b for a, b in zip(sources, cached)):
+            if (img := self.image_to_show) is None:
+                self._normalized = None
+            else:
+                self._normalized = normalize_to_8bits(
+                    img.astype(numpy.uint64),
+                    min=self.minmax[0] if self.minmax else None,
+                    max=self.minmax[1] if self.minmax else None,
                 )
-            )
-        else:
+            self._normalized_sources = sources
+        return self._normalized
+
+    def update_pixmap(self, background: bool = False):
+        """
+        Updates the pixmap with the numpy image to show.
+
+        Args:
+            background (bool): Balance a large image in the global thread pool
+                and replace the pixmap when done, unless another update was
+                made in the meantime.
+        """
+        self._pixmap_generation += 1
+        if (img := self.normalized_image) is None:
             self.setPixmap(QPixmap())  # Clear the pixmap if no image is loaded
+        elif background and img.size >= self.BACKGROUND_BALANCE_PIXELS:
+            assert (pool := QThreadPool.globalInstance()) is not None
+            worker = BalanceWorker(img, self.balances, self._pixmap_generation)
+            worker.signals.done.connect(self._on_balanced)
+            pool.start(worker)
+        else:
+            self.setPixmap(pixmap_from_8bits(apply_balances(img, self.balances)))
+
+    def _on_balanced(self, generation: int, qimage: QImage):
+        """
+        Replaces the pixmap with an image balanced in the background, unless
+        the image has been deleted or removed from its scene since.
+        """
+        if generation != self._pixmap_generation or sip.isdeleted(self):
+            return
+        if self.scene() is not None:
+            self.setPixmap(QPixmap.fromImage(qimage))
 
     @property
     def balances(self) -> tuple[float, float]:
@@ -168,10 +299,23 @@ class NebulaImage(QGraphicsPixmapItem):
         Args:
             value (tuple[float, float]): The new black and white balances.
         """
+        self.set_balances(value)
+
+    def set_balances(self, value: tuple[float, float], background: bool = False):
+        """
+        Sets the black and white balances of the image and updates its pixmap.
+
+        Args:
+            value (tuple[float, float]): The new black and white balances.
+            background (bool): Update the pixmap in the background.
+        """
         if not isinstance(value, tuple) or len(value) != 2:
             raise ValueError("Balances must be a tuple of two floats.")
+        if value == self._balances:
+            # The pixmap is already balanced with these values
+            return
         self._balances = value
-        self.update_pixmap()
+        self.update_pixmap(background)
 
     def mouseDoubleClickEvent(self, event: QGraphicsSceneMouseEvent | None) -> None:
         logging.getLogger(__name__).info("Double clicked on image: %s", self.name)
@@ -468,8 +612,27 @@ class NebulaImageGroup(NebulaImage):
             reference_pattern=reference_pattern,
         )
         self.images: list[NebulaImage] = []
+        # Incremented each time images are added to or removed from the group
+        self.images_version = 0
         self.groupname = groupname
 
+    def add_image(self, image: NebulaImage, index: int | None = None):
+        """
+        Adds an image to the group, at the end or at the given index.
+        """
+        if index is None:
+            self.images.append(image)
+        else:
+            self.images.insert(index, image)
+        self.images_version += 1
+
+    def clear_images(self):
+        """
+        Removes all the images from the group.
+        """
+        self.images.clear()
+        self.images_version += 1
+
     @property
     def name(self) -> str:
         """
@@ -541,6 +704,8 @@ class NebulaImageGroup(NebulaImage):
 
         viewer = self.images[0].viewer
         assert viewer is not None
+        # All the images of the group must be loaded
+        viewer.nebula_studio.flush_pending_loads()
         displacement = viewer.nebula_studio.displacement_size_pixels
         assert displacement is not None
         # Create a big image.
@@ -1,10 +1,9 @@
-from PyQt6.QtCore import Qt, QLocale
+from PyQt6.QtCore import Qt, QLocale, QTimer, QSignalBlocker
 from PyQt6.QtGui import (
     QColor,
     QDragEnterEvent,
     QDragMoveEvent,
     QDropEvent,
-    QIcon,
     QColorConstants,
     QKeyEvent,
 )
@@ -20,12 +19,17 @@ from PyQt6.QtWidgets import (
 
 from .viewer import Viewer
 from PyQt6.QtGui import QKeySequence, QGuiApplication
-from .nebulaimage import NebulaImageGroup
+from .nebulaimage import NebulaImage, NebulaImageGroup
 from .dockwidgets.images_properties import ImagesPropertiesDockWidget
 from .dockwidgets.viewers_selection import ViewersSelectionDockWidget
 from .dockwidgets.image_alignment import ImageAlignmentWindow
+from .utils.yamlfile import SafeLoader
 
+import bisect
 import os
+import string
+from collections import deque
+from collections.abc import Callable
 import yaml
 import logging
 from typing import TYPE_CHECKING, cast, Any
@@ -33,16 +37,108 @@ from typing import TYPE_CHECKING, cast, Any
 if TYPE_CHECKING:
     from .application import NebulaStudioApplication
 
+# Image of a scenario to open in a cell:
+# (group, pattern, filepath, reference pattern, reference filepath)
+PendingImage = tuple[NebulaImageGroup, str, str, str | None, str | None]
+# Cell of the grid whose images are still to be opened: (row, column, images)
+PendingLoad = tuple[int, int, list[PendingImage]]
+
+
+def compile_pattern(pattern: str) -> Callable[[dict[str, Any]], str]:
+    """
+    Parse a ``str.format`` pattern once and return a function applying it to a
+    dictionary of substitutions, equivalent to ``pattern.format(**substitutions)``.
+    """
+    parts = list(string.Formatter().parse(pattern))
+    if any(
+        field is not None
+        and (not field.isidentifier() or (spec is not None and "{" in spec))
+        for _, field, spec, _ in parts
+    ):
+        # Attribute/index lookups and nested specs are left to str.format
+        return lambda substitutions: pattern.format(**substitutions)
+
+    converters = {None: None, "s": str, "r": repr, "a": ascii}
+
+    def apply(substitutions: dict[str, Any]) -> str:
+        chunks = []
+        for literal, field, spec, conversion in parts:
+            chunks.append(literal)
+            if field is not None:
+                value = substitutions[field]
+                if (convert := converters[conversion]) is not None:
+                    value = convert(value)
+                chunks.append(format(value, spec or ""))
+        return "".join(chunks)
+
+    return apply
+
+
+def normalize_range(spec: Any) -> range | list:
+    """
+    Convert a range specification of the configuration file to a range, or to
+    the list of values to iterate over.
+
+    A specification is either ``[start, stop, step]`` style arguments of
+    ``range``, a ``{start, stop, step}`` dictionary, or a list of values.
+    """
+    if isinstance(spec, list):
+        if len(spec) <= 3 and all(isinstance(i, int) for i in spec):
+            return range(*spec)
+        return spec
+
+    if isinstance(spec, dict):
+        if "start" not in spec and "stop" in spec:
+            return range(spec["stop"])
+        return range(spec.get("start", 0), spec.get("stop", 0), spec.get("step", 1))
+
+    return range(0, 1)
+
+
+def _grid_position(image: NebulaImage) -> tuple[int, int]:
+    """
+    Returns the (row, column) of the viewer of an image, (-1, -1) if it has none.
+    """
+    if (viewer := image.viewer) is None:
+        return -1, -1
+    return viewer.row, viewer.column
+
 
 class NebulaStudio(QMainWindow):
-    RETICULA_COLORS: list[QColor | Qt.GlobalColor | int] = [
-        QColorConstants.Red,
-        QColorConstants.Green,
-        QColorConstants.Blue,
-        QColorConstants.Yellow,
-        QColorConstants.Cyan,
-        QColorConstants.Magenta,
-    ]
+    RETICULA_COLORS: tuple[QColor, ...] = tuple(
+        QColor(color)
+        for color in (
+            QColorConstants.Red,
+            QColorConstants.Green,
+            QColorConstants.Blue,
+            QColorConstants.Yellow,
+            QColorConstants.Cyan,
+            QColorConstants.Magenta,
+        )
+    )
+    _NUM_COLORS = len(RETICULA_COLORS)
+    # Menu shortcuts, shared by all windows
+    SHORTCUT_NEW_WINDOW = QKeySequence("Ctrl+N")
+    SHORTCUT_CLOSE_WINDOW = QKeySequence("Ctrl+W")
+    SHORTCUT_SAVE = QKeySequence("Ctrl+S")
+    SHORTCUT_ADD_ROW = QKeySequence("Shift+A")
+    SHORTCUT_REMOVE_ROW = QKeySequence("Shift+R")
+    SHORTCUT_ADD_COLUMN = QKeySequence("A")
+    SHORTCUT_REMOVE_COLUMN = QKeySequence("R")
+    SHORTCUT_REFRESH = QKeySequence("Ctrl+R")
+    SHORTCUT_CHANGE_COLOR = QKeySequence("C")
+    SHORTCUT_FIX_RETICULA = QKeySequence("F")
+    SHORTCUT_CHANGE_OPACITY = QKeySequence("T")
+    SHORTCUT_TOGGLE_RETICULA = QKeySequence("Shift+T")
+    SHORTCUT_SHOW_HIDE_CURSOR = QKeySequence("S")
+    SHORTCUT_DELETE_RETICULA = QKeySequence("D")
+    SHORTCUT_ZOOM_IN = QKeySequence("Ctrl++")
+    SHORTCUT_ZOOM_OUT = QKeySequence("Ctrl+-")
+    SHORTCUT_RESET_ZOOM = QKeySequence("Ctrl+0")
+    SHORTCUT_STITCH_ZOOM = QKeySequence("Ctrl+Shift+Z")
+    SHORTCUT_NEW_PANEL = QKeySequence("Ctrl+I")
+    # Number of bytes of a dragged file read to check it is YAML
+    DROP_HEADER_SIZE = 4096
 
     def __init__(self):
         super().__init__()
@@ -52,7 +148,7 @@ class NebulaStudio(QMainWindow):
 
         self.setWindowTitle(app.applicationName())
         self.setGeometry(100, 100, 800, 600)
-        self.setWindowIcon(QIcon("icon.png"))
+        self.setWindowIcon(self.app.window_icon)
         self.setLocale(QLocale.system())
 
         # Set up the main layout
@@ -88,14 +184,39 @@ class NebulaStudio(QMainWindow):
         # Track internally the number of rows and columns
         self.rows = 0
         self.columns = 0
+        # Rows and columns whose stretch factor was set by new_viewer
+        self._stretched_rows: set[int] = set()
+        self._stretched_columns: set[int] = set()
         # Track visible rows/columns range (inclusive)
         self.visible_row_min = 0
         self.visible_row_max = 0
         self.visible_col_min = 0
         self.visible_col_max = 0
 
-        # List of viewers
+        # Scroll and reticula positions are broadcast to the viewers once per
+        # event loop iteration, with the latest value only
+        self._pending_scroll: tuple[int, int] | None = None
+        self._scroll_timer = QTimer(self)
+        self._scroll_timer.setSingleShot(True)
+        self._scroll_timer.setInterval(0)
+        self._scroll_timer.timeout.connect(self._flush_scroll)
+        self._pending_reticula_pos: tuple[float, float] | None = None
+        self._reticula_timer = QTimer(self)
+        self._reticula_timer.setSingleShot(True)
+        self._reticula_timer.setInterval(0)
+        self._reticula_timer.timeout.connect(self._flush_reticula_pos)
+
+        # Cells of the grid whose images are still to be opened
+        self._pending_loads: deque[PendingLoad] = deque()
+        self._load_timer = QTimer(self)
+        self._load_timer.setInterval(0)
+        self._load_timer.timeout.connect(self._load_next_cell)
+
+        # List of viewers, and the same viewers indexed by (row, column)
         self.viewers: list[Viewer] = []
+        self._grid: dict[tuple[int, int], Viewer] = {}
+        # Snapshot of self.viewers iterated by the per-event broadcasts
+        self._viewers_tuple: tuple[Viewer, ...] = ()
         self.new_viewer()
 
         assert self.rows == 1
@@ -108,77 +229,91 @@ class NebulaStudio(QMainWindow):
         self.visible_col_max = self.columns - 1
 
         self.setAcceptDrops(True)
+        # Last dropped file validated by dragEnterEvent, as (path, mtime)
+        self._accepted_drop: tuple[str, float] | None = None
 
         # Create a menu
         menu = self.menuBar()
         assert menu is not None
         file_menu = menu.addMenu("&File")
         assert file_menu is not None
-        file_menu.addAction("&New Window", QKeySequence("Ctrl+N"), self.app.new_window)
-        file_menu.addAction("&Close Window", QKeySequence("Ctrl+W"), self.close)
         file_menu.addAction(
-            "&Save", QKeySequence("Ctrl+S"), lambda: self.app.save_settings()
+            "&New Window", self.SHORTCUT_NEW_WINDOW, self.app.new_window
+        )
+        file_menu.addAction("&Close Window", self.SHORTCUT_CLOSE_WINDOW, self.close)
+        file_menu.addAction(
+            "&Save", self.SHORTCUT_SAVE, lambda: self.app.save_settings()
         )
 
         viewers_menu = menu.addMenu("&Viewers")
         assert viewers_menu is not None
         viewers_menu.addAction(
             "&Add Viewer Line",
-            QKeySequence("Shift+A"),
+            self.SHORTCUT_ADD_ROW,
             lambda: self.add_viewer_line(True),
         )
         viewers_menu.addAction(
             "&Remove Viewer Line",
-            QKeySequence("Shift+R"),
+            self.SHORTCUT_REMOVE_ROW,
             lambda: self.remove_viewer_line(True),
         )
         viewers_menu.addAction(
-            "&Add Viewer Column", QKeySequence("A"), lambda: self.add_viewer_line(False)
+            "&Add Viewer Column",
+            self.SHORTCUT_ADD_COLUMN,
+            lambda: self.add_viewer_line(False),
         )
         viewers_menu.addAction(
             "&Remove Viewer Column",
-            QKeySequence("R"),
+            self.SHORTCUT_REMOVE_COLUMN,
             lambda: self.remove_viewer_line(False),
         )
         viewers_menu.addAction(
             "&Refresh Images",
-            QKeySequence("Ctrl+R"),
+            self.SHORTCUT_REFRESH,
             self.refresh_viewers,
         )
 
         reticula_menu = menu.addMenu("&Reticula")
         assert reticula_menu is not None
         reticula_menu.addAction(
-            "&Change Color", QKeySequence("C"), self.change_reticula_color
+            "&Change Color", self.SHORTCUT_CHANGE_COLOR, self.change_reticula_color
+        )
+        reticula_menu.addAction(
+            "&Fix Reticula", self.SHORTCUT_FIX_RETICULA, self.fix_reticula
         )
-        reticula_menu.addAction("&Fix Reticula", QKeySequence("F"), self.fix_reticula)
         reticula_menu.addAction(
-            "Change Opaci&ty", QKeySequence("T"), self.change_reticula_opacity
+            "Change Opaci&ty",
+            self.SHORTCUT_CHANGE_OPACITY,
+            self.change_reticula_opacity,
         )
         reticula_menu.addAction(
             "Toggle Reticula Visibility",
-            QKeySequence("Shift+T"),
+            self.SHORTCUT_TOGGLE_RETICULA,
             self.toggle_reticula_visibility,
         )
         reticula_menu.addAction(
-            "&Show/Hide Mouse Pointer", QKeySequence("S"), self.show_hide_cursor
+            "&Show/Hide Mouse Pointer",
+            self.SHORTCUT_SHOW_HIDE_CURSOR,
+            self.show_hide_cursor,
+        )
+        reticula_menu.addAction(
+            "&Delete Closest Reticula", self.SHORTCUT_DELETE_RETICULA
         )
-        reticula_menu.addAction("&Delete Closest Reticula", QKeySequence("D"))
 
         zoom_menu = menu.addMenu("&Zoom")
         assert zoom_menu is not None
         zoom_menu.addAction(
-            "Zoom &In", QKeySequence("Ctrl++"), lambda: self.zoom_viewers(1.2)
+            "Zoom &In", self.SHORTCUT_ZOOM_IN, lambda: self.zoom_viewers(1.2)
         )
         zoom_menu.addAction(
-            "Zoom &Out", QKeySequence("Ctrl+-"), lambda: self.zoom_viewers(0.8)
+            "Zoom &Out", self.SHORTCUT_ZOOM_OUT, lambda: self.zoom_viewers(0.8)
         )
         zoom_menu.addAction(
-            "&Reset Zoom", QKeySequence("Ctrl+0"), lambda: self.set_zoom_viewers(1.0)
+            "&Reset Zoom", self.SHORTCUT_RESET_ZOOM, lambda: self.set_zoom_viewers(1.0)
         )
         zoom_menu.addAction(
             "&Apply Stitch Zoom",
-            QKeySequence("Ctrl+Shift+Z"),
+            self.SHORTCUT_STITCH_ZOOM,
             self.apply_stitch_zoom,
         )
 
@@ -186,11 +321,15 @@ class NebulaStudio(QMainWindow):
         assert image_prop_menu is not None
         image_prop_menu.addAction(
             "&New Image Property Panel",
-            QKeySequence("Ctrl+I"),
+            self.SHORTCUT_NEW_PANEL,
             self.new_image_setting_panel,
         )
 
         self.stitching: dict[str, Any] | None = None
+        # Inputs and result (container width, zoom factor) of the last stitch
+        # zoom, the key is reset when viewers or their images are added
+        self._stitch_zoom_key: tuple | None = None
+        self._stitch_zoom: tuple[int, float] = (0, 1.0)
 
         # Create a group of dockwidgets to adjust images properties
         self.image_prop_dock_widget = ImagesPropertiesDockWidget(self)
@@ -216,20 +355,22 @@ class NebulaStudio(QMainWindow):
     def zoom_viewers(self, factor: float):
         # Zoom all viewers
         for v in self.viewers:
-            v.zoom(factor)
+            with QSignalBlocker(v):
+                v.zoom(factor)
 
     def set_zoom_viewers(self, factor: float = 1.0):
         # Set zoom factor for all viewers
         for v in self.viewers:
-            v.set_zoom(factor)
+            with QSignalBlocker(v):
+                v.set_zoom(factor)
 
     @property
     def displacement_size_pixels(self) -> tuple[int, int] | None:
-        if self.stitching is None:
+        if (stitching := self.stitching) is None:
             return None
-        displacements_um = self.stitching.get("displacements_um")
-        pixel_size_in_um = self.stitching.get("pixel_size_in_um")
-        objective = self.stitching.get("objective", 1.0)
+        displacements_um = stitching.get("displacements_um")
+        pixel_size_in_um = stitching.get("pixel_size_in_um")
+        objective = stitching.get("objective", 1.0)
         if displacements_um is None or pixel_size_in_um is None:
             logging.getLogger(__name__).warning("Stitching settings not found")
             return None
@@ -245,9 +386,12 @@ class NebulaStudio(QMainWindow):
         )
         assert isinstance(objective, (int, float))
 
+        dx, dy = displacements_um["x"], displacements_um["y"]
+        px, py = pixel_size_in_um["x"], pixel_size_in_um["y"]
+
         # Get the size of displacement in pixels
-        viewrect_w = objective * displacements_um["x"] / pixel_size_in_um["x"]
-        viewrect_h = objective * displacements_um["y"] / pixel_size_in_um["y"]
+        viewrect_w = objective * dx / px
+        viewrect_h = objective * dy / py
 
         return (
             int(viewrect_w),
@@ -275,32 +419,39 @@ class NebulaStudio(QMainWindow):
         # Set the zoom factor for all viewers
         container = self.viewers_widget
         assert container is not None
-        # The container of the images must have a size proportional to:
         # Use only visible rows/columns for aspect ratio
         num_visible_rows = max(1, self.visible_row_max - self.visible_row_min + 1)
         num_visible_cols = max(1, self.visible_col_max - self.visible_col_min + 1)
-        container_w = viewrect_w * num_visible_cols
-        container_h = viewrect_h * num_visible_rows
-
-        # Eg a width/height ratio:
-        ratio = container_w / container_h
         # get the current height of the container
         height = container.height()
-        container.setFixedSize(
-            int(height * ratio),
-            int(height),
-        )
-        self.size_fixed = True
 
-        # The viewers must shows a portion of the image of height 'viewrect_h'
-        # Its actual size is 'height'
-        # To show the same portion of image, we need to set the zoom factor
-        zoom_factor = (height / num_visible_rows) / viewrect_h
+        key = (num_visible_rows, num_visible_cols, height, displacements)
+        changed = key != self._stitch_zoom_key
+        if changed:
+            # The container of the images must have a size proportional to:
+            container_w = viewrect_w * num_visible_cols
+            container_h = viewrect_h * num_visible_rows
+
+            # Eg a width/height ratio:
+            ratio = container_w / container_h
+
+            # The viewers must shows a portion of the image of height 'viewrect_h'
+            # Its actual size is 'height'
+            # To show the same portion of image, we need to set the zoom factor
+            zoom_factor = (height / num_visible_rows) / viewrect_h
+
+            self._stitch_zoom_key = key
+            self._stitch_zoom = (int(height * ratio), zoom_factor)
+        width, zoom_factor = self._stitch_zoom
+
+        container.setFixedSize(width, int(height))
+        self.size_fixed = True
 
         for viewer in self.viewers:
             # viewer.setSceneRect
             viewer.set_zoom(zoom_factor)
-            viewer.refresh()
+            if changed:
+                viewer.refresh()
 
     def dragEnterEvent(self, a0: QDragEnterEvent | None) -> None:
         super().dragEnterEvent(a0)
@@ -315,12 +466,28 @@ class NebulaStudio(QMainWindow):
             assert url.isLocalFile()
             path = url.toLocalFile()
             assert path is not None
-            # Check if the file exists
-            if not os.path.isfile(path):
-                raise FileNotFoundError(f"File {path} does not exist")
-            # Check if the file is a valid image
-
-            yaml.load(open(path), Loader=yaml.SafeLoader)
+            # Qt sends this event repeatedly during a single drag. A missing
+            # file makes os.stat or open raise, which rejects the drop
+            drop_key = (path, os.stat(path).st_mtime)
+            if drop_key != self._accepted_drop:
+                # Only validate the beginning of the first YAML document
+                with open(path, "rb") as f:
+                    head = f.read(self.DROP_HEADER_SIZE)
+                if len(head) < self.DROP_HEADER_SIZE:
+                    yaml.load(head.split(b"\n---", 1)[0], Loader=SafeLoader)
+                else:
+                    try:
+                        yaml.load(
+                            head.rsplit(b"\n", 1)[0].split(b"\n---", 1)[0],
+                            Loader=SafeLoader,
+                        )
+                    except yaml.YAMLError:
+                        # The cut may be within a flow collection or a quoted
+                        # scalar, the whole file is validated on drop
+                        logging.getLogger(__name__).debug(
+                            "Header of dropped file %s not parsable alone", path
+                        )
+                self._accepted_drop = drop_key
         except (AssertionError, FileNotFoundError, Exception) as e:
             logging.getLogger(__name__).exception(
                 "Error validating dropped file: %s", e
@@ -341,12 +508,18 @@ class NebulaStudio(QMainWindow):
         assert url.isLocalFile()
         path = url.toLocalFile()
         assert path is not None
-        self.app.load_config(path)
+        try:
+            self.app.load_config(path)
+        except (OSError, yaml.YAMLError):
+            logging.getLogger(__name__).exception(
+                "Error loading dropped file: %s", path
+            )
+            a0.ignore()
+            return
         return super().dropEvent(a0)
 
     def viewer_at(self, row: int, column: int, create: bool = True) -> Viewer | None:
-        item = self.viewers_layout.itemAtPosition(row, column)
-        if item is not None and type(viewer := item.widget()) is Viewer:
+        if (viewer := self._grid.get((row, column))) is not None:
             return viewer
         if not create:
             return None
@@ -376,106 +549,96 @@ class NebulaStudio(QMainWindow):
         ranges = images_dict.get("ranges", {})
         assert isinstance(ranges, dict), "'ranges' key must be a dictionary"
 
-        def to_range(range_key: str | None, ranges: dict[str, Any]):
-            if (
-                not isinstance(ranges, dict)
-                or range_key is None
-                or range_key not in ranges
-            ):
-                return range(0, 1)
-
-            _list = ranges[range_key]
-            if (
-                isinstance(_list, list)
-                and len(_list) <= 3
-                and all(isinstance(i, int) for i in _list)
-            ):
-                return range(*_list)
-
-            if isinstance(_list, dict):
-                if "start" not in _list and "stop" in _list:
-                    return range(_list["stop"])
-                return range(
-                    _list.get("start", 0), _list.get("stop", 0), _list.get("step", 1)
-                )
-
-            if isinstance(_list, list):
-                return enumerate(_list)
-
-            return range(0, 1)
+        # Normalize every range specification once
+        ranges = {key: normalize_range(spec) for key, spec in ranges.items()}
 
         row_key = images_dict.get("row_key")
         column_key = images_dict.get("column_key")
 
-        row_range = to_range(images_dict.get("row_key"), ranges)
-        column_range = to_range(images_dict.get("column_key"), ranges)
+        # Both ranges are sequences of the values to substitute in the patterns
+        row_range = ranges.get(row_key, range(0, 1))
+        column_range = ranges.get(column_key, range(0, 1))
 
         scenarios = images_dict.get("scenarios")
         assert type(scenarios) is list, "'scenarios' key must be a list"
         if scenarios is None or len(scenarios) == 0:
             return
 
-        r = 0
-        w = None
-        for row in row_range:
-            c = 0
-            for column in column_range:
-                replace = True
-                w = self.viewer_at(r, c)
-                assert w is not None
-                substitutions = {}
-                if row_key is not None:
-                    substitutions[row_key] = row if isinstance(row, int) else row[1]
-                if column_key is not None:
-                    substitutions[column_key] = (
-                        column if isinstance(column, int) else column[1]
-                    )
+        # Validate the scenarios and parse their patterns once for the whole grid
+        prepared = []
+        for scenario in scenarios:
+            assert isinstance(scenario, dict), (
+                "'scenarios' must be a list of dictionaries"
+            )
+            name = scenario.get("name")
+            assert isinstance(name, str), "'name' key in scenario must be a string"
+            pattern = scenario.get("pattern")
+            assert isinstance(pattern, str), (
+                "'pattern' key in scenario must be a string"
+            )
+            ref_pattern = scenario.get("reference")
+            if ref_pattern is not None:
+                assert isinstance(ref_pattern, str), (
+                    "'reference' key in scenario must be a string"
+                )
+            if name not in self.scenarios:
+                self.scenarios[name] = NebulaImageGroup(
+                    name, pattern=pattern, reference_pattern=ref_pattern
+                )
+            prepared.append(
+                (
+                    self.scenarios[name],
+                    pattern,
+                    compile_pattern(pattern),
+                    ref_pattern,
+                    compile_pattern(ref_pattern) if ref_pattern is not None else None,
+                )
+            )
 
-                for i, scenario in enumerate(scenarios):
-                    assert isinstance(scenario, dict), (
-                        "'scenarios' must be a list of dictionaries"
-                    )
-                    name = scenario.get("name")
-                    assert isinstance(name, str), (
-                        "'name' key in scenario must be a string"
-                    )
-                    pattern = scenario.get("pattern")
-                    assert isinstance(pattern, str), (
-                        "'pattern' key in scenario must be a string"
-                    )
-                    filepath = pattern.format(**substitutions)
+        substitutions: dict[str, Any] = {}
 
-                    ref_pattern = scenario.get("reference")
-                    if ref_pattern is not None:
-                        assert isinstance(ref_pattern, str), (
-                            "'reference' key in scenario must be a string"
+        # Build the whole grid before letting Qt lay it out and repaint it. The
+        # images are only listed here, they are opened later by _load_next_cell
+        loads: list[PendingLoad] = []
+        self.viewers_widget.setUpdatesEnabled(False)
+        self.setUpdatesEnabled(False)
+        try:
+            for r, row in enumerate(row_range):
+                if row_key is not None:
+                    substitutions[row_key] = row
+                for c, column in enumerate(column_range):
+                    if column_key is not None:
+                        substitutions[column_key] = column
+                    self.viewer_at(r, c)
+                    images: list[PendingImage] = []
+                    for group, pattern, fmt, ref_pattern, ref_fmt in prepared:
+                        ref_filepath = (
+                            ref_fmt(substitutions) if ref_fmt is not None else None
                         )
-                        ref_filepath = ref_pattern.format(**substitutions)
-                    else:
-                        ref_filepath = None
-
-                    if name not in self.scenarios:
-                        group = NebulaImageGroup(
-                            name, pattern=pattern, reference_pattern=ref_pattern
+                        images.append(
+                            (
+                                group,
+                                pattern,
+                                fmt(substitutions),
+                                ref_pattern,
+                                ref_filepath,
+                            )
                         )
-                        self.scenarios[name] = group
-                    else:
-                        group = self.scenarios[name]
-
-                    image = w.open_image(
-                        filepath,
-                        replace=replace,
-                        pattern=pattern,
-                        reference=ref_filepath,
-                        reference_pattern=ref_pattern,
-                    )
-                    if image is not None:
-                        group.images.append(image)
-
-                    replace = False
-
-                c += 1
-            r += 1
+                    loads.append((r, c, images))
+        finally:
+            self.setUpdatesEnabled(True)
+            self.viewers_widget.setUpdatesEnabled(True)
+            self.viewers_widget.updateGeometry()
+
+        # Open the images from the center of the grid outward
+        if loads:
+            center_r = max(r for r, _, _ in loads) / 2
+            center_c = max(c for _, c, _ in loads) / 2
+            loads.sort(
+                key=lambda load: (load[0] - center_r) ** 2 + (load[1] - center_c) ** 2
+            )
+            self._pending_loads.extend(loads)
+            self._load_timer.start()
 
         dock_widgets = list[ImagesPropertiesDockWidget]()
         for scenario in self.scenarios:
@@ -492,7 +655,74 @@ class NebulaStudio(QMainWindow):
         # Update the image selector
         self.image_prop_dock_widget.update_image_selector()
 
+    def _load_cell(self, row: int, column: int, images: list[PendingImage]):
+        """
+        Open the images of a cell of the grid and add them to their scenario.
+        """
+        viewer = self.viewer_at(row, column, create=False)
+        if viewer is None:
+            # The viewer was removed before its images could be loaded
+            return
+        replace = True
+        for group, pattern, filepath, ref_pattern, ref_filepath in images:
+            image = viewer.open_image(
+                filepath,
+                replace=replace,
+                pattern=pattern,
+                reference=ref_filepath,
+                reference_pattern=ref_pattern,
+            )
+            if image is None:
+                logging.getLogger(__name__).warning(
+                    "Cell (%d, %d) of scenario %s not loaded: %s",
+                    row,
+                    column,
+                    group.name,
+                    filepath,
+                )
+            else:
+                # Cells are loaded from the center of the grid, keep the images
+                # of the scenario in the order of the grid
+                group.add_image(
+                    image,
+                    bisect.bisect(group.images, (row, column), key=_grid_position),
+                )
+            replace = False
+        # The next stitch zoom must refresh the viewer with its new images
+        self._stitch_zoom_key = None
+
+    def _load_next_cell(self):
+        """
+        Open the images of the next pending cell, one cell per event loop iteration.
+        """
+        if self._pending_loads:
+            self._load_cell(*self._pending_loads.popleft())
+        if not self._pending_loads:
+            self._load_timer.stop()
+            self._on_pending_loads_done()
+
+    def flush_pending_loads(self):
+        """
+        Synchronously open all the images whose loading was deferred.
+        """
+        if not self._pending_loads:
+            return
+        self._load_timer.stop()
+        while self._pending_loads:
+            self._load_cell(*self._pending_loads.popleft())
+        self._on_pending_loads_done()
+
+    def _on_pending_loads_done(self):
+        # Refresh the panels which were set up before the images were loaded
+        for dw in [self.image_prop_dock_widget, *self.extra_image_prop_dock_widgets]:
+            dw.update_image_selector()
+            if (image := dw.image_panel.image) is not None:
+                dw.image_panel.image = image
+
     def load_settings(self, settings: dict):
+        # Settings refer to images, which must all be loaded
+        self.flush_pending_loads()
+
         if "title" in settings and not self.windowTitle() == settings["title"]:
             # Prevent application of settings if the title does not match
             # the current window title
@@ -579,6 +809,7 @@ class NebulaStudio(QMainWindow):
             r_range = range(self.rows - 1, self.rows)
             c_range = range(self.columns)
             self.viewers_layout.setRowStretch(self.rows - 1, 0)
+            self._stretched_rows.discard(self.rows - 1)
             self.rows -= 1
         else:
             if self.columns == 1:
@@ -586,14 +817,16 @@ class NebulaStudio(QMainWindow):
             r_range = range(self.rows)
             c_range = range(self.columns - 1, self.columns)
             self.viewers_layout.setColumnStretch(self.columns - 1, 0)
+            self._stretched_columns.discard(self.columns - 1)
             self.columns -= 1
         for r in r_range:
             for c in c_range:
-                item = self.viewers_layout.itemAtPosition(r, c)
-                if item is not None and type(viewer := item.widget()) is Viewer:
-                    self.viewers_layout.removeItem(item)
+                viewer = self._grid.pop((r, c), None)
+                if viewer is not None:
+                    self.viewers_layout.removeWidget(viewer)
                     self.viewers.remove(viewer)
                     viewer.deleteLater()
+        self._viewers_tuple = tuple(self.viewers)
 
         # Sync selection ranges and visibility
         self.viewers_selection_dock_widget.sync_ranges()
@@ -611,8 +844,14 @@ class NebulaStudio(QMainWindow):
     def change_reticula_opacity(self):
         self.current_reticula_opacity += 0.1
         self.current_reticula_opacity %= 1.0
-        for viewer in self.viewers:
-            viewer.set_reticula_opacity(self.current_reticula_opacity)
+        # Repaint the viewers once, after all of them are updated
+        self.viewers_widget.setUpdatesEnabled(False)
+        try:
+            for viewer in self.viewers:
+                with QSignalBlocker(viewer):
+                    viewer.set_reticula_opacity(self.current_reticula_opacity)
+        finally:
+            self.viewers_widget.setUpdatesEnabled(True)
 
     def fix_reticula(self):
         for viewer in self.viewers:
@@ -626,12 +865,17 @@ class NebulaStudio(QMainWindow):
         # Calculate the index of the next color
         self.current_reticula_color_index = (
             self.current_reticula_color_index + 1
-        ) % len(self.RETICULA_COLORS)
-        # Change the color of the reticula in all viewers
-        for viewer in self.viewers:
-            viewer.set_reticula_color(
-                self.RETICULA_COLORS[self.current_reticula_color_index]
-            )
+        ) % self._NUM_COLORS
+        # Change the color of the reticula in all viewers, repainting them once
+        self.viewers_widget.setUpdatesEnabled(False)
+        try:
+            for viewer in self.viewers:
+                with QSignalBlocker(viewer):
+                    viewer.set_reticula_color(
+                        self.RETICULA_COLORS[self.current_reticula_color_index]
+                    )
+        finally:
+            self.viewers_widget.setUpdatesEnabled(True)
 
     def new_image_setting_panel(self):
         dw = ImagesPropertiesDockWidget(self)
@@ -645,11 +889,20 @@ class NebulaStudio(QMainWindow):
     ) -> Viewer:
         viewer = Viewer(row, column, self)
         self.viewers.append(viewer)
+        # The next stitch zoom must refresh the new viewer
+        self._stitch_zoom_key = None
+        self._viewers_tuple = tuple(self.viewers)
+        self._grid[(row, column)] = viewer
         if path is not None:
             viewer.open_image(path)
         self.viewers_layout.addWidget(viewer, row, column)
-        self.viewers_layout.setColumnStretch(column, 1)
-        self.viewers_layout.setRowStretch(row, 1)
+        # Only stretch a row or a column when its first viewer is added
+        if column not in self._stretched_columns:
+            self.viewers_layout.setColumnStretch(column, 1)
+            self._stretched_columns.add(column)
+        if row not in self._stretched_rows:
+            self.viewers_layout.setRowStretch(row, 1)
+            self._stretched_rows.add(row)
         viewer.scroll_content_to.connect(self.scroll_all_viewers_to)
         viewer.reticula_pos.connect(self.new_reticula_pos)
         viewer.set_reticula_opacity(self.current_reticula_opacity)
@@ -708,13 +961,30 @@ class NebulaStudio(QMainWindow):
         self.visible_col_max = col_max
 
     def scroll_all_viewers_to(self, x: int, y: int):
-        for viewer in self.viewers:
-            viewer.do_scroll_to(x, y)
-            # viewer.repaint()
+        self._pending_scroll = (x, y)
+        self._scroll_timer.start()
+
+    def _flush_scroll(self):
+        if self._pending_scroll is None:
+            return
+        x, y = self._pending_scroll
+        self._pending_scroll = None
+        for viewer in self._viewers_tuple:
+            with QSignalBlocker(viewer):
+                viewer.do_scroll_to(x, y)
 
     def new_reticula_pos(self, x, y):
-        for viewer in self.viewers:
-            viewer.set_reticula_pos(x, y)
+        self._pending_reticula_pos = (x, y)
+        self._reticula_timer.start()
+
+    def _flush_reticula_pos(self):
+        if self._pending_reticula_pos is None:
+            return
+        x, y = self._pending_reticula_pos
+        self._pending_reticula_pos = None
+        for viewer in self._viewers_tuple:
+            with QSignalBlocker(viewer):
+                viewer.set_reticula_pos(x, y)
 
     # When the window becomes active, update the reticula color
     def activateWindow(self) -> None:
@@ -0,0 +1,5 @@
+import yaml
+
+# Prefer the libyaml bindings when PyYAML was built with them, the pure Python
+# parser is roughly an order of magnitude slower.
+SafeLoader = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
@@ -3,14 +3,16 @@ from PyQt6.QtWidgets import (
     QGraphicsScene,
     QGraphicsPixmapItem,
     QGraphicsLineItem,
+    QGraphicsItemGroup,
     QFrame,
     QMenu,
 )
-from .nebulaimage import NebulaImage, NebulaImageGroup
-from PyQt6.QtGui import QColor
-from PyQt6.QtCore import Qt, pyqtSignal, QLineF
+from .nebulaimage import LoadWorker, NebulaImage, NebulaImageGroup
+from PyQt6.QtGui import QColor, QPen, QTransform
+from PyQt6.QtCore import Qt, QThreadPool, QTimer, pyqtSignal
 from typing import TYPE_CHECKING
 import logging
+import numpy
 import os
 
 if TYPE_CHECKING:
@@ -55,25 +57,64 @@ class Viewer(QGraphicsView):
 
         self.vline = vline
         self.hline = hline
-        self.hline.setPen(
+        # Pen and geometry of the reticula lines, to fix them without reading
+        # them back from the lines
+        self._reticula_pen = self._make_reticula_pen(
             nebula_studio.RETICULA_COLORS[nebula_studio.current_reticula_color_index]
         )
+        self._retx = self._rety = self._retw = self._reth = 0
+        self.hline.setPen(self._reticula_pen)
         self.hline.setZValue(1000)
-        self.vline.setPen(
-            nebula_studio.RETICULA_COLORS[nebula_studio.current_reticula_color_index]
-        )
+        self.vline.setPen(self._reticula_pen)
         self.vline.setZValue(1000)
         self.setMouseTracking(True)
         self.setAcceptDrops(True)
 
-        self.fixed_reticulas: list[tuple[QGraphicsLineItem, QGraphicsLineItem]] = []
-
-        hscrollbar.valueChanged.connect(
-            lambda value: self.scroll_content_to.emit(value, vscrollbar.value())
-        )
-        vscrollbar.valueChanged.connect(
-            lambda value: self.scroll_content_to.emit(hscrollbar.value(), value)
-        )
+        # Lines of the fixed reticulas, in parallel lists
+        self._fixed_hlines: list[QGraphicsLineItem] = []
+        self._fixed_vlines: list[QGraphicsLineItem] = []
+        # Parent of the fixed reticulas lines, which holds their opacity
+        self._fixed_group = QGraphicsItemGroup()
+        self._fixed_group.setZValue(1000)
+        self._scene.addItem(self._fixed_group)
+        # Deleted fixed reticulas lines, hidden until they are removed from the
+        # scene all at once
+        self._pending_removal: list[QGraphicsLineItem] = []
+        self._removal_timer = QTimer(self)
+        self._removal_timer.setSingleShot(True)
+        self._removal_timer.setInterval(0)
+        self._removal_timer.timeout.connect(self._flush_removal)
+        # Size of the pixmap of image_item, updated by _update_image_size
+        self._img_w = self._img_h = 0
+        # Inverse of the size, to normalize positions without dividing
+        self._inv_w = self._inv_h = 0.0
+        # Last pixel of the image hovered by the mouse
+        self._last_hovered_px: tuple[int, int] | None = None
+        # Hovered position is emitted at most once per frame, with the latest
+        # value only
+        self._pending_hover: tuple[float, float] | None = None
+        self._hover_timer = QTimer(self)
+        self._hover_timer.setSingleShot(True)
+        self._hover_timer.setInterval(16)
+        self._hover_timer.timeout.connect(self._flush_hover)
+        # Pixel of the image where the reticula lines were last set
+        self._last_reticula_px: tuple[int, int] | None = None
+        # Position of each fixed reticula, in the order of the lines lists
+        self._fixed_points = numpy.empty((0, 2), dtype=numpy.float32)
+        # Drop action of the accepted drag in progress, set by dragEnterEvent
+        self._drag_action: Qt.DropAction | None = None
+        # Files of the last drop decoded in the thread pool, with their image
+        # once decoded, the number of loads in flight and whether the images
+        # replace the current ones
+        self._drop_loads: list[tuple[str, numpy.ndarray | None]] = []
+        self._drop_pending = 0
+        self._drop_replace = False
+
+        # Values of the scrollbars, kept up to date by their valueChanged signal
+        self._hval = hscrollbar.value()
+        self._vval = vscrollbar.value()
+        hscrollbar.valueChanged.connect(self._on_hscroll)
+        vscrollbar.valueChanged.connect(self._on_vscroll)
 
         self.setAcceptDrops(True)
 
@@ -81,6 +122,14 @@ class Viewer(QGraphicsView):
 
         self.setContentsMargins(0, 0, 0, 0)
 
+    def _on_hscroll(self, value: int):
+        self._hval = value
+        self.scroll_content_to.emit(value, self._vval)
+
+    def _on_vscroll(self, value: int):
+        self._vval = value
+        self.scroll_content_to.emit(self._hval, value)
+
     @property
     def image_item(self) -> QGraphicsPixmapItem | None:
         if self.group.images:
@@ -109,6 +158,7 @@ class Viewer(QGraphicsView):
         pattern: str | None = None,
         reference: None | str = None,
         reference_pattern: str | None = None,
+        decoded: numpy.ndarray | None = None,
     ):
         try:
             image = NebulaImage(
@@ -116,6 +166,7 @@ class Viewer(QGraphicsView):
                 reference_url=reference,
                 pattern=pattern,
                 reference_pattern=reference_pattern,
+                image=decoded,
             )
 
         except Exception:
@@ -128,33 +179,48 @@ class Viewer(QGraphicsView):
             # Remove all image items from the scene
             for image in self.group.images:
                 self._scene.removeItem(image)
-            self.group.images.clear()
+            self.group.clear_images()
 
-        self.group.images.append(image)
+        self.group.add_image(image)
         self._scene.addItem(image)
+        self._update_image_size()
         logging.getLogger(__name__).info(
             "Image item added to scene: %s %d", filename, len(self.group.images)
         )
         return image
 
-    def set_reticula_pos(self, x: float, y: float):
-        visible = self.hline.isVisible()
-        if not visible:
-            return
-        has_image = (image := self.image_item) is not None
-        if has_image:
-            # Get size of the image item
+    def _update_image_size(self):
+        """
+        Caches the size of the pixmap of the displayed image.
+        """
+        if (image := self.image_item) is not None:
             size = image.pixmap().size()
-            width, height = size.width(), size.height()
-            # Calculate the position of the reticula
-            x = int(x * width)
-            y = int(y * height)
-            # Set the position of the reticula
-            self.hline.setLine(x, 0, x, height)
-            self.vline.setLine(0, y, width, y)
+            self._img_w, self._img_h = size.width(), size.height()
+        else:
+            self._img_w = self._img_h = 0
+        self._inv_w = 1.0 / self._img_w if self._img_w else 0.0
+        self._inv_h = 1.0 / self._img_h if self._img_h else 0.0
+        self._last_hovered_px = self._last_reticula_px = None
 
-        self.hline.setVisible(has_image)
-        self.vline.setVisible(has_image)
+    def set_reticula_pos(self, x: float, y: float):
+        hline, vline = self.hline, self.vline
+        if not hline.isVisible():
+            return
+        if not self.group.images:
+            hline.setVisible(False)
+            vline.setVisible(False)
+            return
+        width, height = self._img_w, self._img_h
+        # Calculate the position of the reticula
+        px = (int(x * width), int(y * height))
+        if px == self._last_reticula_px:
+            # The lines are already at this position
+            return
+        self._last_reticula_px = x, y = px
+        self._retx, self._rety, self._retw, self._reth = x, y, width, height
+        # Set the position of the reticula
+        hline.setLine(x, 0, x, height)
+        vline.setLine(0, y, width, y)
 
     def toggle_reticula_visibility(self):
         """
@@ -166,55 +232,76 @@ class Viewer(QGraphicsView):
             visible = self.hline.isVisible()
             self.hline.setVisible(not visible)
             self.vline.setVisible(not visible)
-            for hline, vline in self.fixed_reticulas:
-                if hline is not None and vline is not None:
-                    hline.setVisible(not visible)
-                    vline.setVisible(not visible)
+            for line in self._fixed_hlines + self._fixed_vlines:
+                line.setVisible(not visible)
 
     def set_reticula_opacity(self, opacity: float):
         if self.hline is not None and self.vline is not None:
             self.hline.setOpacity(opacity)
             self.vline.setOpacity(opacity)
-        for hline, vline in self.fixed_reticulas:
-            if hline is not None and vline is not None:
-                hline.setOpacity(opacity)
-                vline.setOpacity(opacity)
+        self._fixed_group.setOpacity(opacity)
 
     def fix_reticula(self):
         """
         Create a static reticula at the current position of the reticula
             and add it to the list of fixed reticulas.
         """
-        hline = self._scene.addLine(QLineF(self.hline.line()), self.hline.pen())
-        vline = self._scene.addLine(QLineF(self.vline.line()), self.vline.pen())
+        x, y, width, height = self._retx, self._rety, self._retw, self._reth
+        pen = self._reticula_pen
+        hline = self._scene.addLine(x, 0, x, height, pen)
+        vline = self._scene.addLine(0, y, width, y, pen)
         assert hline is not None and vline is not None
-        hline.setZValue(1000)
-        vline.setZValue(1000)
-        # Set the opacity of the lines to the same as the original reticula
-        hline.setOpacity(self.hline.opacity())
-        vline.setOpacity(self.vline.opacity())
-        self.fixed_reticulas.append((hline, vline))
+        # The group gives the lines the opacity of the original reticula
+        self._fixed_group.addToGroup(hline)
+        self._fixed_group.addToGroup(vline)
+        self._fixed_hlines.append(hline)
+        self._fixed_vlines.append(vline)
+        # First point of hline, as compared by delete_closest_reticula
+        self._fixed_points = numpy.append(
+            self._fixed_points, numpy.array([[x, 0]], dtype=numpy.float32), axis=0
+        )
 
     def delete_closest_reticula(self):
         """
         Delete the closest fixed reticula from the current position of the reticula.
         """
-        closest: int = -1
-        min_dist: float = 1e10
-        for i, (hline, vline) in enumerate(self.fixed_reticulas):
-            dist = (hline.line().x1() - self.hline.line().x1()) ** 2 + (
-                hline.line().y1() - self.hline.line().y1()
-            ) ** 2
-            if dist < min_dist:
-                min_dist = dist
-                closest = i
-        if closest == -1:
+        if not self._fixed_hlines:
             return
+        # Compare with the first point of hline, in float32 like the points
+        d = self._fixed_points - numpy.array((self._retx, 0), dtype=numpy.float32)
+        closest = int((d * d).sum(axis=1).argmin())
         # Remove the closest reticula
-        hline, vline = self.fixed_reticulas.pop(closest)
-        # Remove the lines from the scene
-        self._scene.removeItem(hline)
-        self._scene.removeItem(vline)
+        self._fixed_points = numpy.delete(self._fixed_points, closest, axis=0)
+        hline = self._fixed_hlines.pop(closest)
+        vline = self._fixed_vlines.pop(closest)
+        # Hide the lines now, they are removed from the scene later with the
+        # other deleted ones
+        hline.setVisible(False)
+        vline.setVisible(False)
+        self._pending_removal += (hline, vline)
+        self._removal_timer.start()
+
+    def _flush_removal(self):
+        """
+        Remove the lines of the deleted fixed reticulas from the scene.
+        """
+        lines, self._pending_removal = self._pending_removal, []
+        self._scene.blockSignals(True)
+        try:
+            for line in lines:
+                self._scene.removeItem(line)
+        finally:
+            self._scene.blockSignals(False)
+
+    @staticmethod
+    def _make_reticula_pen(color: QColor | Qt.GlobalColor | int) -> QPen:
+        """
+        Returns the pen of the reticula lines of the given color. The pen is
+        cosmetic, so its width does not change with the zoom.
+        """
+        pen = QPen(QColor(color))
+        pen.setCosmetic(True)
+        return pen
 
     def set_reticula_color(self, color: QColor | Qt.GlobalColor | int):
         """
@@ -222,8 +309,9 @@ class Viewer(QGraphicsView):
 
         :param color: The color of the reticula to apply.
         """
-        self.hline.setPen(color)
-        self.vline.setPen(color)
+        self._reticula_pen = pen = self._make_reticula_pen(color)
+        self.hline.setPen(pen)
+        self.vline.setPen(pen)
 
     def mouseMoveEvent(self, event):
         """
@@ -231,17 +319,28 @@ class Viewer(QGraphicsView):
 
         :param event: The mouse move event.
         """
-        if event is not None and self.image_item is not None:
-            # Get size of the image item
-            size = self.image_item.pixmap().size()
-            width, height = size.width(), size.height()
-            pos = event.pos()
-            scene_pos = self.mapToScene(pos)
-            x = max(min(width, scene_pos.x()), 0) / width
-            y = max(min(height, scene_pos.y()), 0) / height
-            self.reticula_pos.emit(x, y)
+        if event is not None and (width := self._img_w) and (height := self._img_h):
+            scene_pos = self.mapToScene(event.pos())
+            # Clamp the position to the image
+            x, y = scene_pos.x(), scene_pos.y()
+            x = 0.0 if x < 0 else (width if x > width else x)
+            y = 0.0 if y < 0 else (height if y > height else y)
+            # The reticula is drawn on whole pixels, only emit when it moves
+            if (px := (int(x), int(y))) != self._last_hovered_px:
+                self._last_hovered_px = px
+                self._pending_hover = (x * self._inv_w, y * self._inv_h)
+                if not self._hover_timer.isActive():
+                    self._hover_timer.start()
         super().mouseMoveEvent(event)
 
+    def _flush_hover(self):
+        """
+        Emits the last hovered position.
+        """
+        pos, self._pending_hover = self._pending_hover, None
+        if pos is not None:
+            self.reticula_pos.emit(*pos)
+
     def zoom(self, factor: float):
         # Set the scale of the view
         self.blockSignals(True)
@@ -249,6 +348,9 @@ class Viewer(QGraphicsView):
         self.blockSignals(False)
 
     def set_zoom(self, factor: float = 1.0):
+        if self.transform() == QTransform.fromScale(factor, factor):
+            # Already at this zoom factor
+            return
         # Set the scale of the view
         self.blockSignals(True)
         self.resetTransform()
@@ -292,28 +394,35 @@ class Viewer(QGraphicsView):
             ), f"File {path} is not a valid image"
         except (AssertionError, FileNotFoundError) as e:
             logging.getLogger(__name__).warning("%s", e)
+            self._drag_action = None
             event.ignore()
             return
 
         if Qt.KeyboardModifier.AltModifier in event.modifiers():
-            event.setDropAction(Qt.DropAction.CopyAction)
+            self._drag_action = Qt.DropAction.CopyAction
         else:
-            event.setDropAction(Qt.DropAction.LinkAction)
-
+            self._drag_action = Qt.DropAction.LinkAction
+        event.setDropAction(self._drag_action)
         event.accept()
 
     def dragMoveEvent(self, event):
         super().dragMoveEvent(event)
         assert event is not None
-        if Qt.KeyboardModifier.AltModifier in event.modifiers():
-            event.setDropAction(Qt.DropAction.CopyAction)
-        else:
-            event.setDropAction(Qt.DropAction.LinkAction)
+        # The drag has been validated once in dragEnterEvent
+        if self._drag_action is None:
+            event.ignore()
+            return
+        event.setDropAction(self._drag_action)
         event.accept()
 
+    def dragLeaveEvent(self, event):
+        super().dragLeaveEvent(event)
+        self._drag_action = None
+
     def dropEvent(self, event):
         super().dropEvent(event)
         assert event is not None
+        self._drag_action = None
         mime = event.mimeData()
         assert mime is not None
         # Accept the event if it contains URLs
@@ -321,17 +430,50 @@ class Viewer(QGraphicsView):
             event.ignore()
             return
 
-        replace = Qt.DropAction.CopyAction in event.proposedAction()
-        for url in mime.urls():
-            # Check if the URL is a local file
-            if not url.isLocalFile():
-                continue
-            # Convert the URL to a local file path
-            filename = url.toLocalFile()
-            # Open the image file
-            self.open_image(filename, replace=replace)
-            replace = False
-            event.acceptProposedAction()
+        # Only keep the local files
+        filenames = [url.toLocalFile() for url in mime.urls() if url.isLocalFile()]
+        if not filenames:
+            return
+
+        # Decode the files in the thread pool, and refuse other drops until
+        # they are added to the scene
+        self._drop_replace = Qt.DropAction.CopyAction in event.proposedAction()
+        self._drop_loads = [(filename, None) for filename in filenames]
+        self._drop_pending = len(filenames)
+        self.setAcceptDrops(False)
+        assert (pool := QThreadPool.globalInstance()) is not None
+        for index, filename in enumerate(filenames):
+            worker = LoadWorker(index, filename)
+            worker.signals.done.connect(self._on_drop_loaded)
+            pool.start(worker)
+        event.acceptProposedAction()
+
+    def _on_drop_loaded(self, index: int, image: numpy.ndarray | None, _reference):
+        """
+        Stores a decoded dropped image, and adds the dropped images to the
+        scene once all of them are decoded.
+        """
+        self._drop_loads[index] = (self._drop_loads[index][0], image)
+        self._drop_pending -= 1
+        if self._drop_pending:
+            return
+
+        loads, self._drop_loads = self._drop_loads, []
+        replace = self._drop_replace
+        # Add the images in their drop order, without indexing the scene after
+        # each of them
+        index_method = self._scene.itemIndexMethod()
+        self._scene.setItemIndexMethod(QGraphicsScene.ItemIndexMethod.NoIndex)
+        try:
+            for filename, decoded in loads:
+                if decoded is None:
+                    # The failure has been logged by the worker
+                    continue
+                self.open_image(filename, replace=replace, decoded=decoded)
+                replace = False
+        finally:
+            self._scene.setItemIndexMethod(index_method)
+            self.setAcceptDrops(True)
 
     def refresh(self):
         """
@@ -341,6 +483,7 @@ class Viewer(QGraphicsView):
         """
         for image in self.group.images:
             image.update_pixmap()
+        self._update_image_size()
         # self.set_zoom(1.0)
         # self.setReticulaPos(0.5, 0.5)
 
@@ -0,0 +1,90 @@
+import os
+import pytest
+from nebulastudio import application
+from nebulastudio.application import NebulaStudioApplication
+
+
+@pytest.fixture
+def app(tmp_path, monkeypatch):
+    # The application loads the configuration of the working directory
+    monkeypatch.chdir(tmp_path)
+    (tmp_path / "nebulaconfig.yaml").write_text("[]\n")
+    return NebulaStudioApplication([])
+
+
+@pytest.fixture
+def parses(monkeypatch):
+    """
+    Counts the YAML documents parsed by the application.
+    """
+    calls = []
+    load = application.yaml.load
+
+    def counting_load(*args, **kwargs):
+        calls.append(args)
+        return load(*args, **kwargs)
+
+    monkeypatch.setattr(application.yaml, "load", counting_load)
+    return calls
+
+
+def test_load_yaml_cache_hit(app, tmp_path, parses):
+    path = tmp_path / "a.yaml"
+    path.write_text("key: [1, 2]\n")
+    assert app.load_yaml(str(path)) == {"key": [1, 2]}
+    assert app.load_yaml(str(path)) == {"key": [1, 2]}
+    assert len(parses) == 1
+
+
+def test_load_yaml_invalidated_on_mtime_change(app, tmp_path, parses):
+    path = tmp_path / "a.yaml"
+    path.write_text("key: 1\n")
+    app.load_yaml(str(path))
+    # Same size, newer modification time
+    path.write_text("key: 2\n")
+    stat = os.stat(path)
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+    assert app.load_yaml(str(path)) == {"key": 2}
+    assert len(parses) == 2
+
+
+def test_load_yaml_invalidated_on_size_change(app, tmp_path, parses):
+    path = tmp_path / "a.yaml"
+    path.write_text("key: 1\n")
+    app.load_yaml(str(path))
+    stat = os.stat(path)
+    # Other size, same modification time
+    path.write_text("key: 10\n")
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+    assert app.load_yaml(str(path)) == {"key": 10}
+    assert len(parses) == 2
+
+
+def test_load_yaml_eviction(app, tmp_path, parses):
+    app._yaml_cache.clear()
+    paths = []
+    for i in range(app.YAML_CACHE_SIZE + 1):
+        paths.append(path := str(tmp_path / f"{i}.yaml"))
+        with open(path, "w") as f:
+            f.write(f"key: {i}\n")
+        app.load_yaml(path)
+    assert len(app._yaml_cache) == app.YAML_CACHE_SIZE
+    # The least recently used document was evicted, and is parsed again
+    assert paths[0] not in app._yaml_cache
+    assert paths[-1] in app._yaml_cache
+    app.load_yaml(paths[0])
+    assert len(parses) == app.YAML_CACHE_SIZE + 2
+
+
+def test_load_yaml_returns_copies(app, tmp_path):
+    path = tmp_path / "a.yaml"
+    path.write_text("key: [1, 2]\n")
+    document = app.load_yaml(str(path))
+    document["key"].append(3)
+    document["other"] = True
+    assert app.load_yaml(str(path)) == {"key": [1, 2]}
+
+
+def test_load_yaml_cache_per_instance(app):
+    assert "_yaml_cache" in vars(app)
+    assert not hasattr(NebulaStudioApplication, "_yaml_cache")
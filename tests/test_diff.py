@@ -1,17 +1,46 @@
-from nebulastudio.diff import normalize_to_8bits
+from nebulastudio.diff import apply_balances, normalize_to_8bits
+import numpy as np
+import pytest
 
+# Image already in the [0, 255] range, and its expected 8 bits normalization.
+# Both are read-only, normalize_to_8bits is given a copy since it works in place
+IMAGE = np.array([[0, 128, 255], [64, 192, 32]], dtype=np.uint64)
+IMAGE.setflags(write=False)
+EXPECTED = IMAGE.astype(np.uint8)
+EXPECTED.setflags(write=False)
 
-def test_normalize_to_8bits():
-    import numpy as np
 
+def test_normalize_to_8bits():
     # Test with a simple case
-    image = np.array([[0, 128, 255], [64, 192, 32]], dtype=np.uint64)
-    normalized_image = normalize_to_8bits(image)
+    normalized_image = normalize_to_8bits(IMAGE.copy())
 
     # Check the shape and dtype
     assert normalized_image.shape == (2, 3)
     assert normalized_image.dtype == np.uint8
 
     # Check the values
-    expected = np.array([[0, 128, 255], [64, 192, 32]], dtype=np.uint8)
-    np.testing.assert_array_equal(normalized_image, expected)
+    np.testing.assert_array_equal(normalized_image, EXPECTED)
+
+
+# Every 8 bits value, as a 16x16 image
+ALL_VALUES = np.arange(256, dtype=np.uint8).reshape(16, 16)
+ALL_VALUES.setflags(write=False)
+
+
+@pytest.mark.parametrize(
+    "balances",
+    [
+        (0.0, 1.0),
+        (0.2, 0.8),
+        (0.0, 0.5),
+        (0.5, 1.0),
+        (0.999, 1.0),
+        (0.0, 0.001),
+        (-0.5, 1.5),
+        (1.0, 0.0),
+    ],
+)
+def test_apply_balances_lut_matches_float(balances):
+    # uint8 images are balanced with a lookup table, other ones in float32
+    expected = apply_balances(ALL_VALUES.astype(np.uint16), balances)
+    np.testing.assert_array_equal(apply_balances(ALL_VALUES, balances), expected)
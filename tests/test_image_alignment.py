@@ -0,0 +1,112 @@
+import numpy as np
+import pytest
+from nebulastudio.dockwidgets.image_alignment import (
+    alignment_score,
+    crop_overlap,
+    phase_correlation,
+    search_offset,
+)
+
+# Textured scene, without any smooth basin for the alignment score
+SCENE = np.random.default_rng(0).integers(0, 256, (96, 112), dtype=np.uint8)
+SCENE.setflags(write=False)
+
+
+def views(tx: int, ty: int) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Returns two 64x80 views of the scene, the content of the right one being
+    the one of the left one shifted by (tx, ty): right[i, j] == left[i + ty, j + tx].
+    """
+    left = SCENE[16:80, 16:96]
+    right = SCENE[16 + ty : 80 + ty, 16 + tx : 96 + tx]
+    return left, right
+
+
+def offset_score(left, right, x, y, dx, dy) -> float:
+    """
+    Returns the score of the offset (dx, dy) from (x, y), inf without overlap.
+    """
+    score = alignment_score(left, right, x - dx, y - dy)
+    return np.inf if score is None else score
+
+
+def test_crop_overlap_positive_offset():
+    left, right = views(0, 0)
+    a, b = crop_overlap(left, right, 5, 3)
+    assert a.shape == b.shape == (61, 75)
+    np.testing.assert_array_equal(a, left[3:, 5:])
+    np.testing.assert_array_equal(b, right[:61, :75])
+
+
+def test_crop_overlap_negative_offset():
+    left, right = views(0, 0)
+    a, b = crop_overlap(left, right, -5, -3)
+    assert a.shape == b.shape == (61, 75)
+    np.testing.assert_array_equal(a, left[:61, :75])
+    np.testing.assert_array_equal(b, right[3:, 5:])
+
+
+@pytest.mark.parametrize("x, y", [(80, 0), (0, 64), (-80, 0), (0, -64), (100, 100)])
+def test_crop_overlap_out_of_range(x, y):
+    left, right = views(0, 0)
+    assert crop_overlap(left, right, x, y) is None
+    assert alignment_score(left, right, x, y) is None
+
+
+@pytest.mark.parametrize("tx, ty", [(5, 3), (-10, -7), (0, 12)])
+def test_alignment_score(tx, ty):
+    left, right = views(tx, ty)
+    assert alignment_score(left, right, tx, ty) == 0
+    assert alignment_score(left, right, tx + 1, ty) > 0
+    assert alignment_score(left, right, 0, 0) > 0
+
+
+@pytest.mark.parametrize("dx, dy", [(0, 0), (5, 3), (-10, -7), (7, -12)])
+def test_phase_correlation(dx, dy):
+    # a[i, j] == b[i + dy, j + dx]
+    a = SCENE[16 + dy : 80 + dy, 16 + dx : 96 + dx]
+    b = SCENE[16:80, 16:96]
+    assert phase_correlation(a, b) == (dx, dy)
+
+
+@pytest.mark.parametrize("tx, ty", [(5, 3), (-10, -7), (12, -4)])
+def test_search_offset_recovers_shift(tx, ty):
+    left, right = views(tx, ty)
+    dx, dy = search_offset(left, right, 0, 0, 15)
+    assert (dx, dy) == (-tx, -ty)
+    assert alignment_score(left, right, -dx, -dy) == 0
+
+
+@pytest.mark.parametrize(
+    "tx, ty, x, y, radius",
+    [
+        # Shift within the radius of a distant starting point
+        (5, 3, -4, 9, 12),
+        # Shift out of the radius, no perfect alignment is reachable
+        (14, -14, 0, 0, 6),
+        (-15, 10, 3, -2, 9),
+    ],
+)
+def test_search_offset_finds_local_minimum(tx, ty, x, y, radius):
+    left, right = views(tx, ty)
+    dx, dy = search_offset(left, right, x, y, radius, tolerance=0)
+    assert abs(dx) <= radius and abs(dy) <= radius
+    score = offset_score(left, right, x, y, dx, dy)
+    for nx in range(max(-radius, dx - 1), min(radius, dx + 1) + 1):
+        for ny in range(max(-radius, dy - 1), min(radius, dy + 1) + 1):
+            assert score <= offset_score(left, right, x, y, nx, ny)
+
+
+def test_search_offset_scores_few_offsets():
+    left, right = views(-15, 10)
+    scored = []
+
+    def map_scores(function, offsets):
+        scored.extend(offsets)
+        return map(function, offsets)
+
+    radius = 30
+    search_offset(left, right, 3, -2, radius, map_scores=map_scores)
+    # Each offset is scored once, and far less than by an exhaustive search
+    assert len(scored) == len(set(scored))
+    assert len(scored) < (2 * radius + 1) ** 2 // 10
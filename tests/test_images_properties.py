@@ -0,0 +1,58 @@
+import pytest
+from PyQt6.QtWidgets import QApplication
+from nebulastudio.dockwidgets.images_properties import LinkedSliderSpin
+
+
+@pytest.fixture
+def app():
+    return QApplication.instance() or QApplication([])
+
+
+@pytest.fixture
+def control(app):
+    return LinkedSliderSpin((-100, 100), 10, "px", "Offset")
+
+
+@pytest.fixture
+def emitted(control):
+    values = []
+    control.valueChanged.connect(values.append)
+    return values
+
+
+def test_initial_value(control):
+    assert control.slider.value() == 10
+    assert control.spinbox.value() == 10.0
+    assert control.value() == 10.0
+
+
+def test_slider_updates_spinbox(control, emitted):
+    control.slider.setValue(42)
+    assert control.spinbox.value() == 42.0
+    assert control.slider.value() == 42
+    # A single emission, the update of the spin box is not echoed
+    assert emitted == [42.0]
+
+
+def test_spinbox_updates_slider(control, emitted):
+    control.spinbox.setValue(-7.5)
+    assert control.slider.value() == -7
+    assert control.value() == -7.5
+    assert emitted == [-7.5]
+
+
+def test_set_value_is_silent(control, emitted):
+    control.setValue(25.0)
+    assert control.slider.value() == 25
+    assert control.spinbox.value() == 25.0
+    assert emitted == []
+    # Setting the shown value again leaves the controls untouched
+    control.setValue(25.0)
+    assert emitted == []
+
+
+def test_slider_released_forwarded(control):
+    released = []
+    control.sliderReleased.connect(lambda: released.append(True))
+    control.slider.sliderReleased.emit()
+    assert released == [True]
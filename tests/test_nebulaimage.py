@@ -4,6 +4,11 @@ from os import path
 from nebulastudio.application import NebulaStudioApplication
 import numpy as np
 from hashlib import md5
+from PyQt6.QtCore import QThreadPool
+from PyQt6.QtWidgets import QApplication, QGraphicsScene
+
+# MD5 digest of the data of images/tests/7_1_pe_counter0.npy
+EXPECTED_MD5 = b"\xdah2\xb7\xa5\x00\x95\x03\t\x9ak\xb2\x1c\xea\x7fr"
 
 
 @pytest.fixture
@@ -25,7 +30,7 @@ def test_nebula_image_initialization_png(app):
     assert nebula_image.balances == (0.0, 1.0)
 
     # Get hash of the image data
-    load = np.load(image_url)
+    load = np.load(image_url, mmap_mode="r")
     assert load.shape == (512, 640, 1)
     assert load.dtype == np.uint64
     data = load.tobytes()
@@ -48,18 +53,18 @@ def test_nebula_image_initialization():
     assert nebula_image.balances == (0.0, 1.0)
 
     # Get hash of the image data
-    load = np.load(image_url)
+    load = np.load(image_url, mmap_mode="r")
     assert load.shape == (512, 640, 1)
     assert load.dtype == np.uint64
     data = load.tobytes()
     data2 = nebula_image.image.tobytes()
     assert data == data2
-    assert md5(data2).digest() == md5(data).digest()
-    assert md5(data2).digest() == b"\xdah2\xb7\xa5\x00\x95\x03\t\x9ak\xb2\x1c\xea\x7fr"
+    # data and data2 are equal, hashing one of them is enough
+    assert md5(data2).digest() == EXPECTED_MD5
 
-    assert (
-        nebula_image.reference_image.tobytes() == b"\x00" * 512 * 640 * 8
-    )  # Reference image is all zeros
+    # Reference image is all zeros
+    assert nebula_image.reference_image.nbytes == 512 * 640 * 8
+    assert not nebula_image.reference_image.any()
 
     # Get the second channel of the diff image
     pos = nebula_image.diff_image[:, :, 1]
@@ -70,10 +75,58 @@ def test_nebula_image_initialization():
     assert original.shape == (512, 640)
     assert original.dtype == np.uint64
 
-    assert (original == pos).all()
-    assert (0 == nebula_image.diff_image[:, :, 0]).all()
-    assert (0 == nebula_image.diff_image[:, :, 2]).all()
+    assert np.array_equal(original, pos)
+    assert not nebula_image.diff_image[:, :, 0].any()
+    assert not nebula_image.diff_image[:, :, 2].any()
 
     assert (
         pos.tobytes() == original.tobytes()
     )  # Diff image should match the original image
+
+
+@pytest.fixture
+def qapp():
+    # Application without configuration, for images built from arrays
+    return QApplication.instance() or QApplication([])
+
+
+@pytest.fixture
+def scene(qapp):
+    return QGraphicsScene()
+
+
+@pytest.fixture
+def shown_image(scene):
+    image = NebulaImage(image=np.arange(64 * 80, dtype=np.uint64).reshape(64, 80))
+    scene.addItem(image)
+    return image
+
+
+def wait_background_updates():
+    QThreadPool.globalInstance().waitForDone()
+    # Deliver the queued signals of the workers
+    QApplication.processEvents()
+
+
+def test_small_image_balanced_at_once(shown_image):
+    key = shown_image.pixmap().cacheKey()
+    shown_image.set_balances((0.2, 0.8), background=True)
+    assert shown_image.pixmap().cacheKey() != key
+
+
+def test_large_image_balanced_in_background(shown_image):
+    shown_image.BACKGROUND_BALANCE_PIXELS = 1
+    key = shown_image.pixmap().cacheKey()
+    shown_image.set_balances((0.2, 0.8), background=True)
+    assert shown_image.pixmap().cacheKey() == key
+    wait_background_updates()
+    assert shown_image.pixmap().cacheKey() != key
+
+
+def test_background_balance_skipped_once_removed(scene, shown_image):
+    shown_image.BACKGROUND_BALANCE_PIXELS = 1
+    key = shown_image.pixmap().cacheKey()
+    shown_image.set_balances((0.2, 0.8), background=True)
+    scene.removeItem(shown_image)
+    wait_background_updates()
+    assert shown_image.pixmap().cacheKey() == key
@@ -0,0 +1,69 @@
+import pytest
+from nebulastudio.nebulastudio import compile_pattern, normalize_range
+
+
+@pytest.mark.parametrize(
+    "pattern, substitutions",
+    [
+        ("images/{row}_{column}.npy", {"row": 7, "column": 1}),
+        ("images/{row:03d}/{name!r}.png", {"row": 4, "name": "a"}),
+        ("{x:>{width}}", {"x": "a", "width": 5}),
+        ("{values[1]}.npy", {"values": ["a", "b"]}),
+        ("no_field.npy", {}),
+    ],
+)
+def test_compile_pattern(pattern, substitutions):
+    assert compile_pattern(pattern)(substitutions) == pattern.format(**substitutions)
+
+
+def test_compile_pattern_literal_braces():
+    fmt = compile_pattern("{{row}}_{row}_{{}}.npy")
+    assert fmt({"row": 3}) == "{row}_3_{}.npy"
+
+
+def test_compile_pattern_missing_key():
+    with pytest.raises(KeyError):
+        compile_pattern("{row}_{column}")({"row": 1})
+
+
+@pytest.mark.parametrize(
+    "spec, expected",
+    [
+        ([3], range(3)),
+        ([1, 4], range(1, 4)),
+        ([0, 10, 3], range(0, 10, 3)),
+        ({"stop": 3}, range(3)),
+        ({"start": 2, "stop": 6, "step": 2}, range(2, 6, 2)),
+        (["a", "b"], ["a", "b"]),
+        ([1, 2, 3, 4], [1, 2, 3, 4]),
+    ],
+)
+def test_normalize_range(spec, expected):
+    assert normalize_range(spec) == expected
+
+
+@pytest.mark.parametrize(
+    "spec, expected",
+    [
+        ([5, 0], []),
+        ([5, 0, -1], [5, 4, 3, 2, 1]),
+        ({"start": 5, "stop": 0, "step": -2}, [5, 3, 1]),
+    ],
+)
+def test_normalize_range_reversed(spec, expected):
+    assert list(normalize_range(spec)) == expected
+
+
+@pytest.mark.parametrize(
+    "spec, expected",
+    [
+        ([0], []),
+        ([2, 2], []),
+        ({}, []),
+        ({"start": 3}, []),
+        (None, [0]),
+        ("rows", [0]),
+    ],
+)
+def test_normalize_range_degenerate(spec, expected):
+    assert list(normalize_range(spec)) == expected
@@ -3,6 +3,34 @@ from nebulastudio.application import NebulaStudioApplication
 from PyQt6.QtCore import Qt
 
 
+# Names of the window types and hints, resolved once
+WINDOW_TYPE_NAMES = {
+    Qt.WindowType.Window: "Qt::Window",
+    Qt.WindowType.Dialog: "Qt::Dialog",
+    Qt.WindowType.Drawer: "Qt::Drawer",
+    Qt.WindowType.Popup: "Qt::Popup",
+    Qt.WindowType.Tool: "Qt::Tool",
+    Qt.WindowType.ToolTip: "Qt::ToolTip",
+    Qt.WindowType.SplashScreen: "Qt::SplashScreen",
+}
+WINDOW_HINT_NAMES = (
+    (Qt.WindowType.MSWindowsFixedSizeDialogHint, "Qt::MSWindowsFixedSizeDialogHint"),
+    (Qt.WindowType.X11BypassWindowManagerHint, "Qt::X11BypassWindowManagerHint"),
+    (Qt.WindowType.FramelessWindowHint, "Qt::FramelessWindowHint"),
+    (Qt.WindowType.NoDropShadowWindowHint, "Qt::NoDropShadowWindowHint"),
+    (Qt.WindowType.WindowTitleHint, "Qt::WindowTitleHint"),
+    (Qt.WindowType.WindowSystemMenuHint, "Qt::WindowSystemMenuHint"),
+    (Qt.WindowType.WindowMinimizeButtonHint, "Qt::WindowMinimizeButtonHint"),
+    (Qt.WindowType.WindowMaximizeButtonHint, "Qt::WindowMaximizeButtonHint"),
+    (Qt.WindowType.WindowCloseButtonHint, "Qt::WindowCloseButtonHint"),
+    (Qt.WindowType.WindowContextHelpButtonHint, "Qt::WindowContextHelpButtonHint"),
+    (Qt.WindowType.WindowShadeButtonHint, "Qt::WindowShadeButtonHint"),
+    (Qt.WindowType.WindowStaysOnTopHint, "Qt::WindowStaysOnTopHint"),
+    (Qt.WindowType.WindowStaysOnBottomHint, "Qt::WindowStaysOnBottomHint"),
+    (Qt.WindowType.CustomizeWindowHint, "Qt::CustomizeWindowHint"),
+)
+
+
 @pytest.fixture
 def app():
     return NebulaStudioApplication([])
@@ -17,50 +45,7 @@ def test_window_flags(window):
     flags = window.image_prop_dock_widgets[0].windowFlags()
     type = flags & Qt.WindowType.WindowType_Mask
 
-    if type == Qt.WindowType.Window:
-        text = "Qt::Window"
-    elif type == Qt.WindowType.Dialog:
-        text = "Qt::Dialog"
-    elif type == Qt.WindowType.Drawer:
-        text = "Qt::Drawer"
-    elif type == Qt.WindowType.Popup:
-        text = "Qt::Popup"
-    elif type == Qt.WindowType.Tool:
-        text = "Qt::Tool"
-    elif type == Qt.WindowType.ToolTip:
-        text = "Qt::ToolTip"
-    elif type == Qt.WindowType.SplashScreen:
-        text = "Qt::SplashScreen"
-    else:
-        text = ""
-
-    if flags & Qt.WindowType.MSWindowsFixedSizeDialogHint:
-        text += "\n| Qt::MSWindowsFixedSizeDialogHint"
-    if flags & Qt.WindowType.X11BypassWindowManagerHint:
-        text += "\n| Qt::X11BypassWindowManagerHint"
-    if flags & Qt.WindowType.FramelessWindowHint:
-        text += "\n| Qt::FramelessWindowHint"
-    if flags & Qt.WindowType.NoDropShadowWindowHint:
-        text += "\n| Qt::NoDropShadowWindowHint"
-    if flags & Qt.WindowType.WindowTitleHint:
-        text += "\n| Qt::WindowTitleHint"
-    if flags & Qt.WindowType.WindowSystemMenuHint:
-        text += "\n| Qt::WindowSystemMenuHint"
-    if flags & Qt.WindowType.WindowMinimizeButtonHint:
-        text += "\n| Qt::WindowMinimizeButtonHint"
-    if flags & Qt.WindowType.WindowMaximizeButtonHint:
-        text += "\n| Qt::WindowMaximizeButtonHint"
-    if flags & Qt.WindowType.WindowCloseButtonHint:
-        text += "\n| Qt::WindowCloseButtonHint"
-    if flags & Qt.WindowType.WindowContextHelpButtonHint:
-        text += "\n| Qt::WindowContextHelpButtonHint"
-    if flags & Qt.WindowType.WindowShadeButtonHint:
-        text += "\n| Qt::WindowShadeButtonHint"
-    if flags & Qt.WindowType.WindowStaysOnTopHint:
-        text += "\n| Qt::WindowStaysOnTopHint"
-    if flags & Qt.WindowType.WindowStaysOnBottomHint:
-        text += "\n| Qt::WindowStaysOnBottomHint"
-    if flags & Qt.WindowType.CustomizeWindowHint:
-        text += "\n| Qt::CustomizeWindowHint"
+    text = WINDOW_TYPE_NAMES.get(type, "")
+    text += "".join(f"\n| {name}" for hint, name in WINDOW_HINT_NAMES if flags & hint)
 
     print(text)
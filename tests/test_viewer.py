@@ -0,0 +1,51 @@
+from types import SimpleNamespace
+
+import pytest
+from PyQt6.QtCore import QMimeData, QPointF, Qt, QThreadPool, QUrl
+from PyQt6.QtGui import QDropEvent
+from PyQt6.QtWidgets import QApplication
+from nebulastudio.viewer import Viewer
+
+
+@pytest.fixture
+def app():
+    return QApplication.instance() or QApplication([])
+
+
+@pytest.fixture
+def viewer(app):
+    # Only the reticula color is read from the studio by the viewer itself
+    studio = SimpleNamespace(
+        RETICULA_COLORS=(Qt.GlobalColor.red,), current_reticula_color_index=0
+    )
+    return Viewer(0, 0, studio)
+
+
+def drop(viewer: Viewer, *paths) -> None:
+    """
+    Drops the given files on the viewer and waits for them to be decoded.
+    """
+    mime = QMimeData()
+    mime.setUrls([QUrl.fromLocalFile(str(path)) for path in paths])
+    event = QDropEvent(
+        QPointF(0, 0),
+        Qt.DropAction.LinkAction,
+        mime,
+        Qt.MouseButton.NoButton,
+        Qt.KeyboardModifier.NoModifier,
+    )
+    viewer.dropEvent(event)
+    assert (pool := QThreadPool.globalInstance()) is not None
+    pool.waitForDone()
+    # Deliver the queued signals of the workers
+    QApplication.processEvents()
+
+
+@pytest.mark.parametrize("name", ["empty.npy", "empty.png", "missing.png"])
+def test_drop_unreadable_file_accepts_drops_again(viewer, tmp_path, name):
+    path = tmp_path / name
+    if not name.startswith("missing"):
+        path.touch()
+    drop(viewer, path)
+    assert viewer.acceptDrops()
+    assert viewer.group.images == []
@@ -0,0 +1,58 @@
+import pytest
+import yaml
+from nebulastudio.utils import yamlfile
+
+# Configuration and settings documents, with the keys read by NebulaStudio
+CONFIG = """\
+- title: "Laser scan: 7 × 1"
+  stitching:
+    displacements_um: [50.0, 40.5]
+    pixel_size_in_um: 0.125
+    objective: 5
+  images:
+    row_key: row
+    column_key: col
+    ranges:
+      row: [0, 7]
+      col: {start: 1, stop: 3}
+      zone: [north, 'south', "east"]
+    scenarios:
+      - name: pe_counter
+        pattern: "images/{row}_{col}_pe_counter0.npy"
+        reference: images/zeros.npy
+      - name: raw
+        pattern: 'images/{row:03d}/{col}.png'
+---
+- title: "Laser scan: 7 × 1"
+  scenarios:
+    pe_counter: {balances: [0.1, 0.9], opacity: 1.0}
+  images:
+    7_1_pe_counter0.npy: {position: [-12.5, 3], visible: true}
+  positions:
+    - position: [0, 1]
+      zoom: 2.0
+      scroll: [120, 48]
+    - position: [1, 0]
+      reticula: null
+"""
+
+LOADERS = [yaml.SafeLoader]
+if hasattr(yaml, "CSafeLoader"):
+    LOADERS.append(yaml.CSafeLoader)
+
+
+def test_prefers_libyaml():
+    assert yamlfile.SafeLoader is getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+
+
+@pytest.mark.parametrize("loader", LOADERS, ids=lambda loader: loader.__name__)
+def test_loaders_agree(loader):
+    expected = list(yaml.load_all(CONFIG, Loader=yaml.SafeLoader))
+    assert list(yaml.load_all(CONFIG, Loader=loader)) == expected
+    assert expected[0][0]["images"]["ranges"]["col"] == {"start": 1, "stop": 3}
+
+
+@pytest.mark.parametrize("loader", LOADERS, ids=lambda loader: loader.__name__)
+def test_loaders_are_safe(loader):
+    with pytest.raises(yaml.YAMLError):
+        yaml.load("!!python/object/apply:os.system ['true']", Loader=loader)